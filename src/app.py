@@ -1,21 +1,77 @@
+import argparse
 import asyncio
 from dotenv import load_dotenv
 
 from agents import trace, gen_trace_id
-from research.coordinator import ResearchCoordinator
+from foundation import pdf, preprocess
+from research.coordinator import (
+    BatchRunner,
+    ModelRouter,
+    RateLimiter,
+    ResearchCoordinator,
+    ResponseCache,
+    StepPolicy,
+    load_jobs,
+)
 
 load_dotenv()
 
 
-async def main():
-    researcher = ResearchCoordinator(papers_folder="papers")
+def coordinator_options() -> dict:
+    """
+    Coordinator settings shared by single runs and every job of a batch. The limiter,
+    caches and PDF extractor are created once, so batch jobs share them.
+    """
+    return dict(
+        model_router=ModelRouter(
+            default="gpt-4o-mini",
+            routes={"Paper Writer Agent": "gpt-4o"},
+        ),
+        response_cache=ResponseCache(),
+        pdf_extractor=pdf.PdfExtractor(
+            processes=True,
+            cache=pdf.PdfTextCache(),
+            preprocessor=preprocess.Preprocessor(),
+        ),
+        resume=True,
+        rate_limiter=RateLimiter(max_in_flight=32, requests_per_minute=500, tokens_per_minute=200_000),
+        step_policy=StepPolicy(timeout=300, retries=3),
+        step_policies={"Paper Summary": StepPolicy(timeout=300, retries=3, hedge_percentile=0.95)},
+        min_success_ratio=0.9,
+        stream_paper=True,
+    )
+
+
+async def main(batch: list[str] | None = None, max_jobs: int | None = None):
+    options = coordinator_options()
 
     trace_id = gen_trace_id()
     print(f"Trace URL: https://platform.openai.com/traces/trace?trace_id={trace_id}")
 
-    with trace("Deep Research", trace_id=trace_id):
-        await researcher.research()
+    with trace("Deep Research", trace_id=trace_id), options["pdf_extractor"]:
+        if batch:
+            runner = BatchRunner(
+                load_jobs(batch),
+                output_root="outputs",
+                checkpoint_root=".checkpoints",
+                max_jobs=max_jobs,
+                **options,
+            )
+            await runner.run()
+        else:
+            researcher = ResearchCoordinator(papers_folder="papers", checkpoint_dir=".checkpoints", **options)
+            await researcher.research()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Run the research pipeline.")
+    parser.add_argument(
+        "--batch",
+        nargs="+",
+        metavar="SOURCE",
+        help="Papers folders and/or JSON topic manifests to run concurrently, each writing to outputs/<job>.",
+    )
+    parser.add_argument("--max-jobs", type=int, default=None, help="Maximum number of batch jobs running at once.")
+    args = parser.parse_args()
+
+    asyncio.run(main(batch=args.batch, max_jobs=args.max_jobs))
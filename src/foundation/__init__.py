@@ -1 +1,6 @@
 from . import pdf
+from . import cache
+from . import files
+from . import preprocess
+from . import dedup
+from . import retrieval
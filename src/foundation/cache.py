@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from .files import write_atomic
+
+
+class DiskCache:
+    """
+    A persistent, content-addressed key/value store on the local filesystem.
+
+    Entries are stored as individual files named by their key. A file's modification
+    time records when the entry was written and its access time when it was last read.
+    Entries written more than `max_age` seconds ago are treated as missing however often
+    they are read, and size-based eviction drops the least recently used entries first.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        max_age: Optional[float] = None,
+        enabled: bool = True,
+    ):
+        """
+        Initializes the cache.
+
+        Args:
+            directory (str): Folder in which cache entries are stored.
+            max_entries (int, optional): Maximum number of entries to keep.
+            max_bytes (int, optional): Maximum total size of all entries in bytes.
+            max_age (float, optional): Maximum age of an entry in seconds, counted from
+                when it was written.
+            enabled (bool): When False, every lookup misses and nothing is written.
+        """
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._index: Optional[dict[str, tuple[int, float, float]]] = None
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """
+        Builds a stable SHA-256 key from JSON-serializable parts.
+
+        Args:
+            *parts: Values identifying the cached item.
+
+        Returns:
+            str: Hex digest of the serialized parts.
+        """
+        payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Returns the cached bytes for `key`, or None if missing, expired or disabled.
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            index = self._load_index()
+            path = self._path(key)
+
+            if key in index and not self._expired(index[key][1]):
+                try:
+                    data = path.read_bytes()
+                    now = time.time()
+                    written = index[key][1]
+                    os.utime(path, (now, written))
+                    index[key] = (len(data), written, now)
+                    self.hits += 1
+                    return data
+                except OSError:
+                    pass
+
+            if key in index:
+                self._remove(key)
+            self.misses += 1
+            return None
+
+    def set(self, key: str, data: bytes) -> None:
+        """
+        Stores `data` under `key` and evicts entries exceeding the configured limits.
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            index = self._load_index()
+            write_atomic(self._path(key), data)
+
+            now = time.time()
+            index[key] = (len(data), now, now)
+            self._evict()
+
+    def clear(self) -> None:
+        """
+        Removes every entry from the cache.
+        """
+        with self._lock:
+            for key in list(self._load_index()):
+                self._remove(key)
+
+    @property
+    def stats(self) -> dict:
+        """
+        Hit/miss counters and current size of the cache.
+        """
+        with self._lock:
+            index = self._load_index()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(index),
+                "bytes": sum(size for size, _, _ in index.values()),
+            }
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def _expired(self, written: float) -> bool:
+        return self.max_age is not None and time.time() - written > self.max_age
+
+    def _load_index(self) -> dict[str, tuple[int, float, float]]:
+        """
+        Lazily scans the cache directory into an in-memory index of (size, mtime, atime):
+        the size of each entry, when it was written and when it was last read.
+        """
+        if self._index is None:
+            self._index = {}
+            if self.directory.exists():
+                for path in self.directory.glob("*/*"):
+                    if path.is_file() and not path.name.startswith(".tmp-"):
+                        stat = path.stat()
+                        self._index[path.name] = (stat.st_size, stat.st_mtime, stat.st_atime)
+        return self._index
+
+    def _remove(self, key: str) -> None:
+        self._index.pop(key, None)
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _evict(self) -> None:
+        """
+        Drops expired entries, then the least recently used ones until within limits.
+        """
+        index = self._index
+
+        for key, (_, written, _) in list(index.items()):
+            if self._expired(written):
+                self._remove(key)
+
+        by_access = sorted(index, key=lambda k: index[k][2])
+        total_bytes = sum(size for size, _, _ in index.values())
+
+        while by_access and (
+            (self.max_entries is not None and len(index) > self.max_entries)
+            or (self.max_bytes is not None and total_bytes > self.max_bytes)
+        ):
+            least_recent = by_access.pop(0)
+            total_bytes -= index[least_recent][0]
+            self._remove(least_recent)
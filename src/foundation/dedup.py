@@ -0,0 +1,165 @@
+import re
+import zlib
+from dataclasses import dataclass
+from typing import Optional
+
+_WORD = re.compile(r"\w+")
+_EMPTY = (1 << 64) - 1
+_SEED = 0x9E3779B9
+
+
+def shingles(text: str, size: int = 5) -> set[str]:
+    """
+    Returns the set of word `size`-grams of a text, ignoring case and punctuation.
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash(text: str, num_buckets: int = 128, shingle_size: int = 5) -> tuple[int, ...]:
+    """
+    Computes a MinHash signature of a text with one-permutation hashing.
+
+    Each shingle is hashed once, with two seeded CRC-32s (much cheaper than a
+    cryptographic hash). The hash selects one of `num_buckets` buckets, and each bucket
+    keeps the smallest remaining hash value. The fraction of buckets two signatures
+    agree on estimates the Jaccard similarity of their shingle sets, at the cost of a
+    single hash per shingle rather than one per shingle and permutation.
+
+    Args:
+        text (str): The document text.
+        num_buckets (int): Length of the signature.
+        shingle_size (int): Number of words per shingle.
+
+    Returns:
+        tuple[int, ...]: The signature; empty buckets hold a sentinel value.
+    """
+    signature = [_EMPTY] * num_buckets
+    for shingle in shingles(text, shingle_size):
+        data = shingle.encode("utf-8")
+        value = zlib.crc32(data) << 32 | zlib.crc32(data, _SEED)
+        bucket, rest = value % num_buckets, value // num_buckets
+        if rest < signature[bucket]:
+            signature[bucket] = rest
+    return tuple(signature)
+
+
+def similarity(a: tuple[int, ...], b: tuple[int, ...]) -> float:
+    """
+    Estimates the Jaccard similarity of two documents from their MinHash signatures.
+    """
+    compared = [(x, y) for x, y in zip(a, b) if x != _EMPTY or y != _EMPTY]
+    if not compared:
+        return 1.0
+    return sum(x == y for x, y in compared) / len(compared)
+
+
+@dataclass
+class Duplicate:
+    """
+    A document collapsed into an earlier near-duplicate.
+
+    Attributes:
+        key: Identifier of the dropped document, e.g. its file name.
+        kept: Identifier of the document it duplicates.
+        similarity: Estimated Jaccard similarity of the two documents.
+    """
+    key: str
+    kept: str
+    similarity: float
+
+
+class NearDuplicateIndex:
+    """
+    Online near-duplicate detection with MinHash and locality-sensitive hashing.
+
+    Signatures are split into bands; documents sharing any band are candidates, and a
+    candidate is a duplicate if its estimated similarity reaches `threshold`. Adding a
+    document costs one pass over its shingles plus a few dictionary lookups, so the
+    index stays cheap for thousands of documents.
+
+    Of near-duplicates, the document with the smallest key is kept whatever the order
+    they are added in, so the choice does not depend on e.g. extraction order.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_buckets: int = 128, bands: int = 16, shingle_size: int = 5):
+        """
+        Initializes the index.
+
+        Args:
+            threshold (float): Minimum estimated Jaccard similarity of near-duplicates.
+            num_buckets (int): Length of the MinHash signatures.
+            bands (int): Number of LSH bands; must divide `num_buckets`. More bands find
+                candidates of lower similarity at the cost of more comparisons.
+            shingle_size (int): Number of words per shingle.
+        """
+        if num_buckets % bands:
+            raise ValueError(f"num_buckets ({num_buckets}) must be divisible by bands ({bands})")
+        self.threshold = threshold
+        self.num_buckets = num_buckets
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self.signatures: dict[str, tuple[int, ...]] = {}
+        self.duplicates: list[Duplicate] = []
+        self._buckets: dict[tuple, list[str]] = {}
+
+    def add(self, key: str, text: str) -> Optional[Duplicate]:
+        """
+        Checks a document against the indexed ones and indexes it if it is new.
+
+        Args:
+            key (str): Identifier of the document.
+            text (str): The document text.
+
+        Returns:
+            Duplicate | None: None if the document is new. Otherwise the dropped document:
+            the new one if its key sorts after its match (it is then not indexed), or the
+            indexed match, which the new document replaces in the index.
+        """
+        signature = minhash(text, self.num_buckets, self.shingle_size)
+        bands = self._bands(signature)
+
+        best: Optional[Duplicate] = None
+        seen: set[str] = set()
+        for band in bands:
+            for candidate in self._buckets.get(band, []):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                score = similarity(signature, self.signatures[candidate])
+                if score >= self.threshold and (best is None or score > best.similarity):
+                    best = Duplicate(key=key, kept=candidate, similarity=round(score, 3))
+
+        if best is not None and key < best.kept:
+            displaced = best.kept
+            self._remove(displaced)
+            for duplicate in self.duplicates:
+                if duplicate.kept == displaced:
+                    duplicate.kept = key
+            self._index(key, signature, bands)
+            best = Duplicate(key=displaced, kept=key, similarity=best.similarity)
+
+        if best is not None:
+            self.duplicates.append(best)
+            return best
+
+        self._index(key, signature, bands)
+        return None
+
+    def _bands(self, signature: tuple[int, ...]) -> list[tuple]:
+        rows = self.num_buckets // self.bands
+        return [(band, signature[band * rows:(band + 1) * rows]) for band in range(self.bands)]
+
+    def _index(self, key: str, signature: tuple[int, ...], bands: list[tuple]) -> None:
+        self.signatures[key] = signature
+        for band in bands:
+            # Bands made only of empty buckets (very short texts) carry no information
+            if any(value != _EMPTY for value in band[1]):
+                self._buckets.setdefault(band, []).append(key)
+
+    def _remove(self, key: str) -> None:
+        for band in self._bands(self.signatures.pop(key)):
+            if key in self._buckets.get(band, []):
+                self._buckets[band].remove(key)
@@ -0,0 +1,34 @@
+import os
+import tempfile
+from pathlib import Path
+from typing import Union
+
+
+def write_atomic(path: Union[str, Path], data: Union[bytes, str]) -> None:
+    """
+    Writes a file by writing a temporary file in the same folder and renaming it over
+    the target, so readers never see a partially written file. The data is flushed to
+    disk before the rename, so the file also survives a crash intact.
+
+    Temporary files are named `.tmp-*`.
+
+    Args:
+        path: Destination file.
+        data: File contents; strings are encoded as UTF-8.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
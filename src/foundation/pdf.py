@@ -1,18 +1,359 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, Iterable, Optional
+
 import fitz
 
-def read_pdf(file_path: str) -> str:
+from .cache import DiskCache
+from .files import write_atomic
+from .preprocess import PaperText, Preprocessor
+
+
+class PdfTextCache:
+    """
+    Persistent cache of text extracted from PDF files.
+
+    Extracted text is stored zlib-compressed and addressed by the SHA-256 of the
+    PDF's contents. A small index maps each file path to its last seen size,
+    modification time and content hash, so unchanged files are resolved from a
+    `stat` call alone and modified files are re-hashed (and re-parsed only if their
+    contents actually changed). Texts produced with different preprocessing settings
+    are stored under different variants of the same file.
+    """
+
+    def __init__(
+        self,
+        directory: str = ".cache/pdf",
+        max_bytes: Optional[int] = None,
+        enabled: bool = True,
+    ):
+        """
+        Initializes the cache.
+
+        Args:
+            directory (str): Folder in which the index and extracted texts are stored.
+            max_bytes (int, optional): Maximum total size of the compressed texts.
+            enabled (bool): When False the cache is bypassed entirely.
+        """
+        self.directory = Path(directory)
+        self.store = DiskCache(str(self.directory / "texts"), max_bytes=max_bytes, enabled=enabled)
+        self._index_path = self.directory / "index.json"
+        self._index: Optional[dict] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.store.enabled
+
+    @enabled.setter
+    def enabled(self, value: bool):
+        self.store.enabled = value
+
+    @property
+    def stats(self) -> dict:
+        return self.store.stats
+
+    def get(self, file_path: str, variant: Optional[str] = None) -> Optional[str]:
+        """
+        Returns the cached text of `file_path`, or None if it has not been extracted
+        in its current state.
+
+        Args:
+            file_path (str): Path to the PDF file.
+            variant (str, optional): Identifies how the text was processed; None for the raw text.
+        """
+        if not self.enabled:
+            return None
+        data = self.store.get(self._key(self._content_hash(file_path), variant))
+        return zlib.decompress(data).decode("utf-8") if data is not None else None
+
+    def set(self, file_path: str, text: str, variant: Optional[str] = None) -> None:
+        """
+        Stores the extracted text of `file_path` under the given variant.
+        """
+        if not self.enabled:
+            return
+        content_hash = self._content_hash(file_path)
+        self.store.set(self._key(content_hash, variant), zlib.compress(text.encode("utf-8"), 6))
+
+    def _content_hash(self, file_path: str) -> str:
+        """
+        Returns the SHA-256 of the file's contents, re-hashing only when its size or
+        modification time differ from the indexed values.
+        """
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+
+        with self._lock:
+            entry = self._load_index().get(path)
+            if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                return entry["sha256"]
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        content_hash = digest.hexdigest()
+
+        with self._lock:
+            index = self._load_index()
+            index[path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": content_hash}
+            self._save_index(index)
+
+        return content_hash
+
+    @staticmethod
+    def _key(content_hash: str, variant: Optional[str] = None) -> str:
+        if variant is None:
+            return DiskCache.make_key("pdf-text", content_hash)
+        return DiskCache.make_key("pdf-text", content_hash, variant)
+
+    def _load_index(self) -> dict:
+        if self._index is None:
+            try:
+                with self._index_path.open("r", encoding="utf-8") as f:
+                    self._index = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._index = {}
+        return self._index
+
+    def _save_index(self, index: dict) -> None:
+        write_atomic(self._index_path, json.dumps(index))
+
+
+def read_pdf(
+    file_path: str,
+    cache: Optional[PdfTextCache] = None,
+    preprocessor: Optional[Preprocessor] = None,
+) -> str:
     """
     Extracts and returns all text from a PDF file using PyMuPDF.
 
     Args:
         file_path (str): Path to the PDF file.
+        cache (PdfTextCache, optional): Cache consulted before parsing and updated afterwards.
+        preprocessor (Preprocessor, optional): Strips boilerplate from the extracted pages.
 
     Returns:
         str: Complete extracted text from the PDF.
     """
+    return read_paper(file_path, cache, preprocessor).text
+
+
+def read_paper(
+    file_path: str,
+    cache: Optional[PdfTextCache] = None,
+    preprocessor: Optional[Preprocessor] = None,
+) -> PaperText:
+    """
+    Extracts the text of a PDF file, preprocessed if a preprocessor is given.
+
+    Args:
+        file_path (str): Path to the PDF file.
+        cache (PdfTextCache, optional): Cache consulted before parsing and updated afterwards.
+        preprocessor (Preprocessor, optional): Strips boilerplate from the extracted pages and
+            extracts the references.
+
+    Returns:
+        PaperText: The text of the paper, with its references if they were extracted.
+    """
+    cached = _cached_paper(cache, file_path, preprocessor)
+    if cached is not None:
+        return cached
+
+    try:
+        with fitz.open(file_path) as doc:
+            pages = [page.get_text("text").strip() for page in doc]
+    except Exception as e:
+        raise RuntimeError(f"Error reading PDF '{file_path}': {e}")
+
+    paper = _process_pages(pages, preprocessor)
+    _cache_paper(cache, file_path, preprocessor, paper)
+    return paper
+
+
+def page_count(file_path: str) -> int:
+    """
+    Returns the number of pages in a PDF file without extracting any text.
+    """
     try:
         with fitz.open(file_path) as doc:
-            text_pages = [page.get_text("text").strip() for page in doc]
-        return "\n\n".join(text_pages)
+            return doc.page_count
     except Exception as e:
         raise RuntimeError(f"Error reading PDF '{file_path}': {e}")
+
+
+def read_pdf_pages(file_path: str, start: int, stop: int) -> list[str]:
+    """
+    Extracts the text of pages [start, stop) of a PDF file.
+
+    Defined at module level so it can be dispatched to worker processes.
+
+    Args:
+        file_path (str): Path to the PDF file.
+        start (int): Index of the first page to extract.
+        stop (int): Index one past the last page to extract.
+
+    Returns:
+        list[str]: The stripped text of each page in the range, in order.
+    """
+    try:
+        with fitz.open(file_path) as doc:
+            return [doc[i].get_text("text").strip() for i in range(start, min(stop, doc.page_count))]
+    except Exception as e:
+        raise RuntimeError(f"Error reading PDF '{file_path}' pages {start}-{stop}: {e}")
+
+
+class PdfExtractor:
+    """
+    Extracts text from many PDF files concurrently with a bounded number of workers.
+
+    In thread mode each file is parsed by `read_paper` on a worker thread. In process
+    mode large documents are split into page ranges that are parsed in parallel by a
+    process pool and reassembled in order, so CPU-bound extraction scales with cores.
+    The output is identical in both modes.
+
+    With a preprocessor, running headers and footers, the bibliography and optionally
+    the appendices are stripped from the returned texts, and the references parsed
+    from each bibliography are returned with them.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        processes: bool = False,
+        pages_per_task: int = 32,
+        cache: Optional[PdfTextCache] = None,
+        preprocessor: Optional[Preprocessor] = None,
+    ):
+        """
+        Initializes the extractor.
+
+        Args:
+            workers (int, optional): Maximum number of concurrent extractions. Defaults to the CPU count.
+            processes (bool): Extract in a process pool instead of threads.
+            pages_per_task (int): Number of pages handled by a single process-pool task.
+            cache (PdfTextCache, optional): Cache consulted before parsing and updated afterwards.
+            preprocessor (Preprocessor, optional): Strips boilerplate from the extracted texts.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.processes = processes
+        self.pages_per_task = pages_per_task
+        self.cache = cache
+        self.preprocessor = preprocessor
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def read_paper(self, file_path: str) -> PaperText:
+        """
+        Extracts the text of a single PDF file, with its references if the preprocessor
+        extracts them.
+
+        Args:
+            file_path (str): Path to the PDF file.
+
+        Returns:
+            PaperText: The (preprocessed) text of the paper.
+        """
+        if not self.processes:
+            async with self._limit():
+                paper = await asyncio.to_thread(read_paper, file_path, self.cache, self.preprocessor)
+        else:
+            paper = await asyncio.to_thread(_cached_paper, self.cache, file_path, self.preprocessor)
+            if paper is None:
+                pages = await asyncio.to_thread(page_count, file_path)
+                loop = asyncio.get_running_loop()
+                pool = self._get_pool()
+                chunks = await asyncio.gather(*[
+                    loop.run_in_executor(pool, read_pdf_pages, file_path, start, start + self.pages_per_task)
+                    for start in range(0, pages, self.pages_per_task)
+                ])
+                paper = await asyncio.to_thread(
+                    _process_pages, [page for chunk in chunks for page in chunk], self.preprocessor
+                )
+                await asyncio.to_thread(_cache_paper, self.cache, file_path, self.preprocessor, paper)
+        return paper
+
+    async def iter_read_papers(self, paths: Iterable[str]) -> AsyncIterator[tuple[str, PaperText]]:
+        """
+        Extracts several PDF files concurrently, yielding each one as soon as it is done.
+
+        Args:
+            paths (Iterable[str]): Paths of the PDF files to read.
+
+        Yields:
+            tuple[str, PaperText]: The path and (preprocessed) text of each file, in completion order.
+        """
+        async def read_with_path(path: str) -> tuple[str, PaperText]:
+            return path, await self.read_paper(path)
+
+        tasks = [asyncio.create_task(read_with_path(path)) for path in paths]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def close(self) -> None:
+        """
+        Shuts down the worker process pool, if one was started.
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def _limit(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.workers)
+        return self._semaphore
+
+
+def _process_pages(pages: list[str], preprocessor: Optional[Preprocessor]) -> PaperText:
+    if preprocessor is None:
+        return PaperText(text="\n\n".join(pages))
+    return preprocessor(pages)
+
+
+def _cached_paper(
+    cache: Optional[PdfTextCache], file_path: str, preprocessor: Optional[Preprocessor]
+) -> Optional[PaperText]:
+    """
+    Looks up a paper in the cache. Raw texts are stored as plain text, preprocessed
+    papers as JSON under the preprocessor's variant.
+    """
+    if cache is None:
+        return None
+    if preprocessor is None:
+        text = cache.get(file_path)
+        return PaperText(text=text) if text is not None else None
+    data = cache.get(file_path, preprocessor.variant)
+    return PaperText.from_json(data) if data is not None else None
+
+
+def _cache_paper(
+    cache: Optional[PdfTextCache], file_path: str, preprocessor: Optional[Preprocessor], paper: PaperText
+) -> None:
+    if cache is None:
+        return
+    if preprocessor is None:
+        cache.set(file_path, paper.text)
+    else:
+        cache.set(file_path, paper.to_json(), preprocessor.variant)
@@ -0,0 +1,257 @@
+import json
+import math
+import re
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+
+from .text import is_heading
+
+# Version of the preprocessing rules; part of the cache key of preprocessed texts
+PREPROCESS_VERSION = 2
+
+_PAGE_NUMBER = re.compile(r"^(?:page\s*)?[-–—]?\s*\d{1,4}\s*[-–—]?(?:\s*(?:of|/)\s*\d{1,4})?$", re.IGNORECASE)
+_REFERENCES_HEADING = re.compile(
+    r"^(?:#+\s*)?(?:\d+\.?\s+|[IVXLC]+\.\s+)?(?:references|bibliography|works cited|literature cited)\s*:?$",
+    re.IGNORECASE,
+)
+_APPENDIX_HEADING = re.compile(
+    r"^(?:#+\s*)?(?:[A-Z]\.?\s+|\d+\.?\s+)?(?:appendix|appendices|supplementary materials?)\b",
+    re.IGNORECASE,
+)
+_NUMBERED_REFERENCE = re.compile(r"^\s*(?:\[\d{1,4}\]|\d{1,4}\.)\s+")
+_AUTHOR_START = re.compile(r"^[A-Z][A-Za-z'\-]+,\s+(?:[A-Z]\.|[A-Z][a-z]+)")
+
+
+@dataclass
+class PaperText:
+    """
+    The text of a paper after preprocessing.
+
+    Attributes:
+        text: The body text, without running headers/footers and (optionally) the
+            bibliography and appendices, with section headings tagged as `## Heading`.
+        references: Entries of the bibliography, one citation per item, if extracted.
+        sections: Headings of the sections found in the body, in order.
+        removed_lines: Number of running header, footer and page number lines removed.
+    """
+    text: str
+    references: list[str] = field(default_factory=list)
+    sections: list[str] = field(default_factory=list)
+    removed_lines: int = 0
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, data: str) -> "PaperText":
+        return cls(**json.loads(data))
+
+
+@dataclass(frozen=True)
+class Preprocessor:
+    """
+    Cleans the per-page text of a paper before it is sent to the agents.
+
+    Attributes:
+        strip_running_lines: Remove header and footer lines repeated across pages, and page numbers.
+        min_repeat_ratio: Fraction of pages a header/footer line must appear on to be removed.
+        margin_lines: Number of lines at the top and bottom of each page considered header/footer.
+        drop_references: Remove the bibliography from the text.
+        extract_references: Parse the bibliography into `PaperText.references`.
+        drop_appendix: Remove appendices following the main text.
+        tag_sections: Mark section headings as `## Heading` lines.
+    """
+    strip_running_lines: bool = True
+    min_repeat_ratio: float = 0.5
+    margin_lines: int = 3
+    drop_references: bool = True
+    extract_references: bool = True
+    drop_appendix: bool = False
+    tag_sections: bool = True
+
+    @property
+    def variant(self) -> str:
+        """
+        Identifies the preprocessing settings, so cached texts of different variants never mix.
+        """
+        return json.dumps({"version": PREPROCESS_VERSION, **asdict(self)}, sort_keys=True)
+
+    def __call__(self, pages: list[str]) -> PaperText:
+        """
+        Preprocesses a paper.
+
+        Args:
+            pages (list[str]): The extracted text of each page, in order.
+
+        Returns:
+            PaperText: The cleaned text with its references and sections.
+        """
+        removed = 0
+        if self.strip_running_lines:
+            pages, removed = strip_running_lines(pages, self.min_repeat_ratio, self.margin_lines)
+
+        body, references, appendix = split_back_matter("\n\n".join(page for page in pages if page.strip()))
+
+        parts = [body]
+        if references and not self.drop_references:
+            parts.append(references)
+        if appendix and not self.drop_appendix:
+            parts.append(appendix)
+        text = "\n\n".join(part for part in parts if part)
+
+        sections: list[str] = []
+        if self.tag_sections:
+            text, sections = tag_sections(text)
+
+        return PaperText(
+            text=text,
+            references=parse_references(references) if self.extract_references else [],
+            sections=sections,
+            removed_lines=removed,
+        )
+
+
+def strip_running_lines(pages: list[str], min_ratio: float = 0.5, margin: int = 3) -> tuple[list[str], int]:
+    """
+    Removes running headers, footers and page numbers from the pages of a document.
+
+    A line near the top or bottom of a page is considered a running line if a line
+    with the same signature (case-insensitive, with digits masked so "Page 3" and
+    "Page 4" match) appears in the margins of at least `min_ratio` of the pages.
+    Lines consisting only of a page number are removed from the margins regardless.
+
+    Args:
+        pages (list[str]): The text of each page.
+        min_ratio (float): Fraction of pages on which a line must repeat (at least two pages).
+        margin (int): Number of non-blank lines at the top and bottom of a page to inspect.
+
+    Returns:
+        tuple[list[str], int]: The cleaned pages and the number of lines removed.
+    """
+    page_lines = [page.splitlines() for page in pages]
+    margins = [_margin_indexes(lines, margin) for lines in page_lines]
+
+    counts: Counter = Counter()
+    for lines, indexes in zip(page_lines, margins):
+        counts.update({_signature(lines[i]) for i in indexes})
+    threshold = max(2, math.ceil(min_ratio * len(pages)))
+    repeated = {signature for signature, count in counts.items() if count >= threshold}
+
+    cleaned, removed = [], 0
+    for lines, indexes in zip(page_lines, margins):
+        kept = []
+        for i, line in enumerate(lines):
+            if i in indexes and (_signature(line) in repeated or _PAGE_NUMBER.match(line.strip())):
+                removed += 1
+                continue
+            kept.append(line)
+        cleaned.append("\n".join(kept).strip())
+    return cleaned, removed
+
+
+def split_back_matter(text: str) -> tuple[str, str, str]:
+    """
+    Splits a paper into its body, bibliography and appendices.
+
+    The bibliography starts at the last "References" (or "Bibliography") heading. An
+    appendix starts at the first appendix heading after the bibliography or, without a
+    bibliography, in the second half of the text.
+
+    Returns:
+        tuple[str, str, str]: The body, the bibliography without its heading, and the
+        appendices; missing parts are empty strings.
+    """
+    lines = text.splitlines()
+    references_start = next(
+        (i for i in range(len(lines) - 1, -1, -1) if _REFERENCES_HEADING.match(lines[i].strip())),
+        None,
+    )
+
+    search_from = references_start + 1 if references_start is not None else len(lines) // 2
+    appendix_start = next(
+        (
+            i for i in range(search_from, len(lines))
+            if _APPENDIX_HEADING.match(lines[i].strip()) and is_heading(lines[i])
+        ),
+        len(lines),
+    )
+
+    body_end = references_start if references_start is not None else appendix_start
+    body = "\n".join(lines[:body_end]).strip()
+    references = (
+        "\n".join(lines[references_start + 1:appendix_start]).strip() if references_start is not None else ""
+    )
+    appendix = "\n".join(lines[appendix_start:]).strip()
+    return body, references, appendix
+
+
+def parse_references(text: str) -> list[str]:
+    """
+    Splits a bibliography into individual citations.
+
+    Numbered styles ("[12] ..." or "12. ...") are split at the numbers; other styles at
+    blank lines, or at lines starting with an author name ("Surname, X.") after a line
+    ending with a period. Line breaks and hyphenation inside an entry are joined.
+
+    Args:
+        text (str): The bibliography, without its heading.
+
+    Returns:
+        list[str]: One string per citation, without numbering.
+    """
+    lines = [line.strip() for line in text.splitlines()]
+    numbered = sum(bool(_NUMBERED_REFERENCE.match(line)) for line in lines) >= 2
+    entries: list[list[str]] = []
+    current: list[str] = []
+
+    for line in lines:
+        if not line:
+            if current and not numbered:
+                entries.append(current)
+                current = []
+            continue
+
+        if current and (
+            _NUMBERED_REFERENCE.match(line) if numbered
+            else current[-1].endswith(".") and _AUTHOR_START.match(line)
+        ):
+            entries.append(current)
+            current = []
+        current.append(line)
+
+    if current:
+        entries.append(current)
+
+    references = []
+    for entry in entries:
+        joined = entry[0]
+        for line in entry[1:]:
+            joined = joined[:-1] + line if joined.endswith("-") else f"{joined} {line}"
+        references.append(_NUMBERED_REFERENCE.sub("", joined).strip())
+    return [reference for reference in references if reference]
+
+
+def tag_sections(text: str) -> tuple[str, list[str]]:
+    """
+    Marks section headings as `## Heading` lines.
+
+    Returns:
+        tuple[str, list[str]]: The tagged text and the headings found, in order.
+    """
+    lines, sections = [], []
+    for line in text.splitlines():
+        if is_heading(line) and not line.lstrip().startswith("#"):
+            heading = line.strip()
+            sections.append(heading)
+            line = f"## {heading}"
+        lines.append(line)
+    return "\n".join(lines), sections
+
+
+def _margin_indexes(lines: list[str], margin: int) -> set[int]:
+    non_blank = [i for i, line in enumerate(lines) if line.strip()]
+    return set(non_blank[:margin] + non_blank[-margin:])
+
+
+def _signature(line: str) -> str:
+    return re.sub(r"\d+", "#", " ".join(line.lower().split()))
@@ -0,0 +1,168 @@
+import hashlib
+import heapq
+import json
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional
+
+from .pdf import PdfTextCache
+from .text import chunk_text
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9\-]*[a-z0-9]|[a-z0-9]")
+_STOPWORDS = frozenset(
+    "a an and are as at be been but by can for from has have if in into is it its of on or our "
+    "such than that the their them then there these they this to was we were which while will "
+    "with within without".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Splits a text into lowercase index terms, dropping stopwords and single characters.
+    """
+    return [term for term in _WORD.findall(text.lower()) if len(term) > 1 and term not in _STOPWORDS]
+
+
+def split_passages(text: str, max_tokens: int = 300) -> list[str]:
+    """
+    Splits a paper into retrieval passages of at most `max_tokens` (estimated) tokens,
+    cut at paragraph and section boundaries where possible.
+    """
+    return chunk_text(text, max_tokens)
+
+
+def paper_passages(
+    file_path: str,
+    text: str,
+    max_tokens: int = 300,
+    cache: Optional[PdfTextCache] = None,
+) -> tuple[list[str], list[dict[str, int]]]:
+    """
+    Splits a paper into passages and counts their terms, reusing the result stored in
+    the PDF text cache when the paper was indexed before.
+
+    The entry is keyed by the file's contents, the passage size and a hash of the text,
+    so papers preprocessed differently are indexed separately.
+
+    Args:
+        file_path (str): Path to the PDF file.
+        text (str): The extracted (and possibly preprocessed) text of the paper.
+        max_tokens (int): Maximum estimated token count per passage.
+        cache (PdfTextCache, optional): Cache holding the extracted texts.
+
+    Returns:
+        tuple[list[str], list[dict[str, int]]]: The passages and their term counts.
+    """
+    variant = f"passages:{max_tokens}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+    if cache is not None:
+        cached = cache.get(file_path, variant)
+        if cached is not None:
+            data = json.loads(cached)
+            return data["passages"], data["terms"]
+
+    passages = split_passages(text, max_tokens)
+    terms = BM25Index.analyze(passages)
+    if cache is not None:
+        cache.set(file_path, json.dumps({"passages": passages, "terms": terms}, ensure_ascii=False), variant)
+    return passages, terms
+
+
+@dataclass
+class Passage:
+    """
+    A retrievable passage of a paper.
+
+    Attributes:
+        source: Identifier of the paper, e.g. its file name.
+        position: Index of the passage within the paper.
+        text: The passage text.
+    """
+    source: str
+    position: int
+    text: str
+
+
+class BM25Index:
+    """
+    An in-memory inverted index over paper passages, ranked with Okapi BM25.
+
+    Documents are added with their passages and per-passage term counts, which can be
+    computed once per paper (see `analyze`) and cached, so building the index for a
+    run is a matter of merging postings.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """
+        Initializes an empty index.
+
+        Args:
+            k1 (float): Term frequency saturation.
+            b (float): Strength of the passage length normalization.
+        """
+        self.k1 = k1
+        self.b = b
+        self.passages: list[Passage] = []
+        self._lengths: list[int] = []
+        self._postings: dict[str, dict[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.passages)
+
+    @staticmethod
+    def analyze(passages: list[str]) -> list[dict[str, int]]:
+        """
+        Returns the term counts of each passage.
+        """
+        return [dict(Counter(tokenize(passage))) for passage in passages]
+
+    def add(self, source: str, passages: list[str], term_counts: Optional[list[dict[str, int]]] = None) -> None:
+        """
+        Indexes the passages of a paper.
+
+        Args:
+            source (str): Identifier of the paper.
+            passages (list[str]): The paper's passages, in order.
+            term_counts (list[dict[str, int]], optional): Precomputed result of `analyze(passages)`.
+        """
+        for position, (passage, counts) in enumerate(zip(passages, term_counts or self.analyze(passages))):
+            passage_id = len(self.passages)
+            self.passages.append(Passage(source=source, position=position, text=passage))
+            self._lengths.append(sum(counts.values()))
+            for term, count in counts.items():
+                self._postings.setdefault(term, {})[passage_id] = count
+
+    def search(self, query: str, k: int = 5) -> list[tuple[Passage, float]]:
+        """
+        Returns the `k` passages most relevant to a query.
+
+        Args:
+            query (str): Free-text query.
+            k (int): Number of passages to return.
+
+        Returns:
+            list[tuple[Passage, float]]: Passages with their BM25 scores, best first.
+        """
+        if not self.passages:
+            return []
+
+        total = len(self.passages)
+        average_length = sum(self._lengths) / total or 1.0
+        scores: dict[int, float] = {}
+
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for passage_id, count in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[passage_id] / average_length)
+                scores[passage_id] = scores.get(passage_id, 0.0) + idf * count * (self.k1 + 1) / (count + norm)
+
+        best = heapq.nsmallest(
+            k,
+            scores.items(),
+            key=lambda item: (-item[1], self.passages[item[0]].source, self.passages[item[0]].position),
+        )
+        return [(self.passages[passage_id], score) for passage_id, score in best]
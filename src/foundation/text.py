@@ -0,0 +1,164 @@
+import re
+
+# Rough number of characters per token for English prose with GPT tokenizers
+CHARS_PER_TOKEN = 4
+
+_SECTION_NAMES = (
+    r"Abstract|Introduction|Background|Motivation|Overview|Preliminaries|Related Work|Prior Work|"
+    r"Problem (?:Statement|Formulation|Definition)|Approach|Methods?|Methodology|Materials|"
+    r"(?:System )?(?:Design|Architecture)|Implementation|Experiments?|"
+    r"Experimental (?:Setup|Results|Evaluation)|Evaluation|Setup|Results|Analysis|Case Study|"
+    r"Ablation Stud(?:y|ies)|Discussion|Limitations|Threats to Validity|Future Work|Conclusions?|"
+    r"Summary|Acknowledge?ments?|References|Bibliography|Appendix|Appendices|Supplementary Materials?"
+)
+# Known section names, alone or joined, e.g. "Conclusion and Future Work"
+_SECTION_NAME = re.compile(
+    rf"^(?:{_SECTION_NAMES})(?:\s*(?:,|and|&)\s*(?:{_SECTION_NAMES}))*$", re.IGNORECASE
+)
+# Section numbers: "3", "2.1", "IV." or "A."; four-digit numbers such as years are not section numbers
+_SECTION_NUMBER = re.compile(r"^(?:\d{1,2}(?:\.\d{1,2})*\.?|[IVXLC]{1,5}\.|[A-Z]\.)\s+(?=\S)")
+_APPENDIX_LABEL = re.compile(r"^Appendi(?:x|ces)(?:\s+[A-Z\d]{1,2}\b)?[:.]?\s*", re.IGNORECASE)
+_CAPITALS_HEADING = re.compile(r"^[A-Z][A-Z \-&]{2,60}$")
+_SMALL_WORDS = frozenset(
+    "a an and as at by for from in into of on or over the to under via vs versus with without".split()
+)
+# Words a heading never ends with, but a line broken mid-sentence often does
+_TRAILING_WORDS = _SMALL_WORDS | frozenset("but nor that which our their its is are per".split())
+MAX_HEADING_WORDS = 10
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimates the number of tokens in a text without a tokenizer.
+
+    Args:
+        text (str): The text to measure.
+
+    Returns:
+        int: Approximate token count.
+    """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def is_heading(line: str) -> bool:
+    """
+    Returns True if a line looks like a section heading of a paper, including headings
+    already tagged as `## Heading`.
+
+    A heading is at most `MAX_HEADING_WORDS` words, does not end with punctuation, a
+    conjunction or a preposition, and is one of:
+    - a known section name, optionally numbered: "Introduction", "3. Related Work";
+    - an appendix label, optionally titled: "Appendix B: Proofs";
+    - a numbered title-case line: "2.1 Experimental Setup", "IV. Scaling Behavior";
+    - an all-capitals line: "PROPOSED FRAMEWORK".
+    """
+    line = line.strip().lstrip("#").strip()
+    if not 0 < len(line) <= 80 or line.endswith((".", ",", ";", ":")):
+        return False
+    words = line.split()
+    if len(words) > MAX_HEADING_WORDS or words[-1].lower() in _TRAILING_WORDS:
+        return False
+
+    number = _SECTION_NUMBER.match(line)
+    title = line[number.end():] if number else line
+    if _SECTION_NAME.match(title):
+        return True
+    appendix = _APPENDIX_LABEL.match(title)
+    if appendix:
+        rest = title[appendix.end():]
+        return not rest or _is_title_case(rest)
+    if number:
+        return _is_title_case(title)
+    return bool(_CAPITALS_HEADING.match(title))
+
+
+def _is_title_case(text: str) -> bool:
+    """
+    Returns True if the first word and every word other than articles, conjunctions and
+    prepositions start with a capital letter (or a digit or symbol).
+    """
+    words = text.split()
+    if not words or not words[0][0].isupper():
+        return False
+    return all(
+        not word[0].islower() or word.lower() in _SMALL_WORDS
+        for word in words[1:]
+    )
+
+
+def chunk_text(text: str, max_tokens: int) -> list[str]:
+    """
+    Splits a text into chunks of at most `max_tokens` (estimated) tokens.
+
+    Chunks are built from whole paragraphs and are preferably cut at section
+    headings, so each chunk covers coherent sections of the document. Paragraphs
+    longer than the budget are split on sentence boundaries, and as a last resort
+    on character boundaries.
+
+    Args:
+        text (str): The text to split.
+        max_tokens (int): Maximum estimated token count per chunk.
+
+    Returns:
+        list[str]: The chunks, in document order.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    chunks: list[str] = []
+    current = ""
+
+    for piece, continues in _pieces(text, max_chars):
+        separator = " " if continues else "\n\n"
+        starts_section = not continues and is_heading(piece.split("\n", 1)[0])
+
+        # Break at a section boundary once the chunk is reasonably full
+        if current and (
+            (starts_section and len(current) >= max_chars // 2)
+            or len(current) + len(separator) + len(piece) > max_chars
+        ):
+            chunks.append(current)
+            current = ""
+
+        current = f"{current}{separator}{piece}" if current else piece
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _pieces(text: str, max_chars: int) -> list[tuple[str, bool]]:
+    """
+    Splits a text into paragraphs, breaking paragraphs longer than `max_chars` into
+    sentences (and overlong sentences into fixed-size slices).
+
+    Paragraphs end at blank lines and before section headings, since extracted PDF
+    text rarely separates a heading from the preceding paragraph with a blank line.
+
+    Returns:
+        list[tuple[str, bool]]: Each piece with a flag telling whether it continues
+        the previous piece's paragraph.
+    """
+    blocks: list[str] = []
+    lines: list[str] = []
+    for line in text.splitlines():
+        if not line.strip() or is_heading(line):
+            if lines:
+                blocks.append("\n".join(lines))
+            lines = []
+        if line.strip():
+            lines.append(line.rstrip())
+    if lines:
+        blocks.append("\n".join(lines))
+
+    pieces = []
+    for block in blocks:
+        if len(block) <= max_chars:
+            pieces.append((block, False))
+            continue
+
+        continues = False
+        for sentence in _SENTENCE_END.split(block):
+            for start in range(0, len(sentence), max_chars):
+                pieces.append((sentence[start:start + max_chars], continues))
+                continues = True
+    return pieces
@@ -10,6 +10,10 @@ from .results_analyzer import results_analyzer_agent
 from .abstract_generator import abstract_generator_agent
 from .reference_geneartor import reference_generator_agent
 from .paper_writer import paper_writer_agent
+from .chunk_summarizer import chunk_summarizer_agent
+from .summary_reducer import summary_reducer_agent
+from .synthesis_merger import synthesis_merger_agent
+from .output_repair import output_repair_agent
 
 
 __all__ = [
@@ -25,4 +29,8 @@ __all__ = [
     "abstract_generator_agent",
     "reference_generator_agent",
     "paper_writer_agent",
+    "chunk_summarizer_agent",
+    "summary_reducer_agent",
+    "synthesis_merger_agent",
+    "output_repair_agent",
 ]
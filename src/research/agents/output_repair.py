@@ -0,0 +1,43 @@
+from agents import Agent
+
+from .response import OutputRepair
+
+
+OUTPUT_REPAIR_PROMPT = """
+You repair structured responses. A previous response to the task of the "{name}" was mostly valid, but some of its parts do not match the required JSON schema.
+
+You will receive a JSON object with:
+- "schema": the JSON schema of the complete response,
+- "invalid": a list of parts to fix, each with its "path", its "current_value" (null if missing) and the validation "errors" found in it,
+- "context": the valid parts of the response, for reference.
+
+Instructions:
+- Return exactly one fix per invalid part, using its path unchanged.
+- Each fix must contain the complete corrected value for its path, encoded as JSON, satisfying the schema.
+- Keep the existing content of each part wherever it is valid; only add missing fields and correct wrong ones, consistently with the context.
+- Do NOT return or modify any other part of the response.
+"""
+
+_repair_agents: dict[str, Agent] = {}
+
+
+def output_repair_agent(agent: Agent) -> Agent:
+    """
+    Returns an agent that fixes the invalid parts of a structured response of `agent`.
+
+    The repair agent only receives the invalid parts, their validation errors and the
+    output schema, so fixing a small error costs a small call.
+
+    Args:
+        agent (Agent): The agent whose responses need repairing.
+
+    Returns:
+        Agent: The repair agent for `agent`.
+    """
+    if agent.name not in _repair_agents:
+        _repair_agents[agent.name] = agent.clone(
+            name=f"{agent.name} Repair",
+            instructions=OUTPUT_REPAIR_PROMPT.format(name=agent.name),
+            output_type=OutputRepair,
+        )
+    return _repair_agents[agent.name]
@@ -9,5 +9,6 @@ from .experiment import Experiments
 from .results_analysis import ResultsAnalysis
 from .abstract import Abstract
 from .reference import References
+from .output_repair import FieldFix, OutputRepair
 
-__all_ = ["PaperSummary", "RelatedWorkSummary", "GapIdentifierResult", "IntroductionSection", "ResearchQuestions", "Hypotheses", "MethodologyPlan", "SystemDesign", "Experiments", "ResultsAnalysis", "Abstract", "References"]
+__all_ = ["PaperSummary", "RelatedWorkSummary", "GapIdentifierResult", "IntroductionSection", "ResearchQuestions", "Hypotheses", "MethodologyPlan", "SystemDesign", "Experiments", "ResultsAnalysis", "Abstract", "References", "FieldFix", "OutputRepair"]
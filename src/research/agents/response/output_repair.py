@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+
+class FieldFix(BaseModel):
+    """
+    A corrected value for one invalid part of a structured response.
+    """
+    path: str = Field(..., description="Path of the corrected value, exactly as given in the request, e.g. 'experiments.2'.")
+    value_json: str = Field(..., description="The complete corrected value at that path, encoded as JSON.")
+
+
+class OutputRepair(BaseModel):
+    """
+    Corrections for the invalid parts of a structured response, leaving every valid part untouched.
+    """
+    fixes: List[FieldFix] = Field(
+        ...,
+        description="One fix per requested path, each replacing the value at that path."
+    )
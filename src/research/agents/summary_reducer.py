@@ -0,0 +1,51 @@
+from agents import Agent
+
+from .response import PaperSummary
+
+
+SUMMARY_REDUCER_PROMPT = """
+You are an expert AI research assistant. You will receive a JSON list of partial summaries of a single research paper, each produced from a consecutive excerpt of the paper and given in document order. Your task is to merge them into one structured summary of the whole paper.
+
+Instructions:
+
+- Produce the following fields for the paper as a whole:
+    - "title": The full paper title, taken from the partial summaries.
+    - "abstract": The paper's abstract, or a generated one based on the partial summaries.
+    - "keywords": A list of 5-10 key terms or topics covered by the paper.
+    - "key_contributions": The main contributions or findings, deduplicated and consolidated.
+    - "methodology": A concise description of the methodology or approach used in the paper.
+    - "results_summary": The key results, outcomes, or insights of the paper.
+    - "limitations": The limitations stated or implied in the paper, deduplicated.
+    - "referenced_works": The most notable papers, technologies, datasets, or standards cited.
+    - "domain_track" (optional): The IEEE track or domain this paper belongs to.
+
+- Merge overlapping items and resolve repetitions; prefer the more specific statement.
+- Use only information present in the partial summaries. Never fabricate or hallucinate content.
+
+Output Format (JSON):
+
+{
+    "title": "...",
+    "abstract": "...",
+    "keywords": ["...", "...", "..."],
+    "key_contributions": ["...", "...", "..."],
+    "methodology": "...",
+    "results_summary": "...",
+    "limitations": ["...", "..."],
+    "referenced_works": ["...", "..."],
+    "domain_track": "..."
+}
+
+Constraints:
+
+- Do not include any explanation or notes outside the JSON.
+- Keep fields concise but information-rich.
+- Use "null" for missing values and empty lists ([]) where applicable.
+"""
+
+
+summary_reducer_agent = Agent(
+    name="Summary Reducer Agent",
+    instructions=SUMMARY_REDUCER_PROMPT,
+    output_type=PaperSummary,
+)
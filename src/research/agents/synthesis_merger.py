@@ -0,0 +1,40 @@
+from agents import Agent
+
+
+SYNTHESIS_MERGER_PROMPT = """
+You are an expert AI research assistant. A large set of research papers was split into clusters of related papers, and the task below was carried out separately on each cluster. You will receive the partial results as a JSON object of the form {{"partial_results": [...]}}.
+
+Your goal is to merge the partial results into a single result covering the whole set of papers, exactly as if the task had been carried out on all papers at once.
+
+Instructions:
+- Preserve every distinct point, grouping, and observation from the partial results.
+- Merge overlapping content and remove repetition; connect themes across clusters.
+- Do NOT fabricate or speculate beyond the partial results.
+- Follow the output format and style required by the original task.
+
+Original task:
+{task}
+"""
+
+_merger_agents: dict[str, Agent] = {}
+
+
+def synthesis_merger_agent(agent: Agent) -> Agent:
+    """
+    Returns an agent that merges partial results of `agent` computed on subsets of its input.
+
+    The merger shares the original agent's output type, so merged results are
+    interchangeable with results produced in a single call.
+
+    Args:
+        agent (Agent): The cross-paper agent whose partial results need merging.
+
+    Returns:
+        Agent: The merger agent for `agent`.
+    """
+    if agent.name not in _merger_agents:
+        _merger_agents[agent.name] = agent.clone(
+            name=f"{agent.name} Merger",
+            instructions=SYNTHESIS_MERGER_PROMPT.format(task=agent.instructions),
+        )
+    return _merger_agents[agent.name]
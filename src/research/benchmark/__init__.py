@@ -0,0 +1,14 @@
+from .corpus import generate_corpus
+from .fake import FakeAgentRunner, FakeCall, InjectedError, Latency, fake_output
+from .harness import BenchmarkReport, run_benchmark
+
+__all__ = [
+    "generate_corpus",
+    "FakeAgentRunner",
+    "FakeCall",
+    "InjectedError",
+    "Latency",
+    "fake_output",
+    "BenchmarkReport",
+    "run_benchmark",
+]
@@ -0,0 +1,43 @@
+import argparse
+import asyncio
+import json
+import logging
+from dataclasses import asdict
+
+from foundation import pdf
+from .fake import Latency
+from .harness import run_benchmark
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark of the research pipeline.")
+    parser.add_argument("--papers", type=int, default=20, help="Number of synthetic papers.")
+    parser.add_argument("--pages", type=int, default=8, help="Pages per paper.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Mean fake agent latency in seconds.")
+    parser.add_argument("--distribution", default="lognormal", choices=["constant", "uniform", "lognormal"])
+    parser.add_argument("--spread", type=float, default=0.5, help="Spread of the latency distribution.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of failing agent calls.")
+    parser.add_argument("--workers", type=int, default=None, help="PDF extraction workers.")
+    parser.add_argument("--processes", action="store_true", help="Extract PDFs in a process pool.")
+    parser.add_argument("--max-concurrency", type=int, default=None, help="Maximum concurrent steps.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with pdf.PdfExtractor(workers=args.workers, processes=args.processes) as extractor:
+        report = asyncio.run(run_benchmark(
+            papers=args.papers,
+            pages=args.pages,
+            latency=Latency(args.latency, args.distribution, args.spread),
+            error_rate=args.error_rate,
+            seed=args.seed,
+            pdf_extractor=extractor,
+            max_concurrency=args.max_concurrency,
+        ))
+
+    print(json.dumps(asdict(report), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import os
+import random
+
+import fitz
+
+_WORDS = (
+    "model data system latency cache pipeline agent graph network training inference "
+    "distributed cloud scheduling throughput memory evaluation benchmark dataset accuracy "
+    "optimization retrieval summarization transformer protocol storage workload cluster"
+).split()
+
+_SECTIONS = ["Abstract", "1 Introduction", "2 Related Work", "3 Method", "4 Experiments", "5 Conclusion", "References"]
+
+
+def generate_corpus(folder: str, papers: int, pages: int = 8, seed: int = 0) -> list[str]:
+    """
+    Writes `papers` synthetic PDF papers of `pages` pages each into `folder`.
+
+    The papers contain section headings and pseudo-random prose, so extraction,
+    chunking and the pipeline exercise the same code paths as with real papers.
+
+    Args:
+        folder (str): Output folder, created if missing.
+        papers (int): Number of PDFs to generate.
+        pages (int): Number of pages per PDF.
+        seed (int): Seed of the random generator, for reproducible corpora.
+
+    Returns:
+        list[str]: Paths of the generated PDF files.
+    """
+    rng = random.Random(seed)
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+
+    for index in range(papers):
+        path = os.path.join(folder, f"paper_{index:04d}.pdf")
+        with fitz.open() as doc:
+            for page_number in range(pages):
+                page = doc.new_page()
+                lines = [f"Synthetic Paper {index}", ""]
+                if page_number * len(_SECTIONS) // pages != (page_number - 1) * len(_SECTIONS) // pages:
+                    lines.append(_SECTIONS[page_number * len(_SECTIONS) // pages])
+                lines.extend(" ".join(rng.choices(_WORDS, k=12)) for _ in range(40))
+                lines.append(str(page_number + 1))
+                page.insert_text((50, 50), "\n".join(lines), fontsize=8)
+            doc.save(path)
+        paths.append(path)
+
+    return paths
@@ -0,0 +1,153 @@
+import asyncio
+import hashlib
+import math
+import random
+import time
+import typing
+from dataclasses import dataclass
+from typing import Any, Union
+
+from pydantic import BaseModel
+
+
+class InjectedError(asyncio.TimeoutError):
+    """
+    Error raised by the fake runner to simulate a transient provider failure.
+    Subclasses TimeoutError so that step policies treat it as retryable.
+    """
+
+
+@dataclass
+class Latency:
+    """
+    Latency distribution of a fake agent call.
+
+    Attributes:
+        mean: Mean latency in seconds.
+        distribution: One of "constant", "uniform" (mean ± spread) or "lognormal".
+        spread: Half-width for "uniform", or the sigma of the underlying normal for "lognormal".
+    """
+    mean: float
+    distribution: str = "lognormal"
+    spread: float = 0.5
+
+    def sample(self, rng: random.Random) -> float:
+        if self.distribution == "constant":
+            return self.mean
+        if self.distribution == "uniform":
+            return max(0.0, rng.uniform(self.mean - self.spread, self.mean + self.spread))
+        if self.distribution == "lognormal":
+            # Parameterized so that the distribution's mean equals `mean`
+            return rng.lognormvariate(0.0, self.spread) * self.mean / math.exp(self.spread ** 2 / 2)
+        raise ValueError(f"Unknown latency distribution: {self.distribution}")
+
+
+@dataclass
+class FakeCall:
+    """
+    A call served by the fake runner.
+    """
+    agent: str
+    started: float
+    ended: float
+    failed: bool
+
+
+class FakeAgentRunner:
+    """
+    Deterministic stand-in for a model-backed agent runner.
+
+    Sleeps for a latency drawn from a configurable distribution, fails a configurable
+    fraction of calls with a transient error, and otherwise returns a canned response
+    that validates against the agent's `output_type`. Usable anywhere an agent runner
+    is expected, e.g. `Pipeline.run(FakeAgentRunner())`.
+
+    Every call draws from its own generator, seeded with the runner's seed, the agent,
+    the input and the attempt number, so a seed reproduces the same latencies and
+    failures however concurrent calls interleave.
+    """
+
+    def __init__(
+        self,
+        latency: Union[float, Latency, dict[str, Latency]] = 0.05,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        """
+        Initializes the fake runner.
+
+        Args:
+            latency: Mean latency in seconds, a Latency distribution, or distributions by agent
+                name (with an optional "*" entry as the default).
+            error_rate: Probability that a call raises InjectedError.
+            seed: Seed of the random generators, for reproducible runs.
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.seed = seed
+        self.calls: list[FakeCall] = []
+        self._attempts: dict[tuple[str, str], int] = {}
+
+    async def __call__(self, agent, agent_input: str) -> Any:
+        rng = self._rng_for(agent.name, agent_input)
+        started = time.perf_counter()
+        await asyncio.sleep(self._latency_for(agent.name).sample(rng))
+        failed = rng.random() < self.error_rate
+        self.calls.append(FakeCall(agent.name, started, time.perf_counter(), failed))
+
+        if failed:
+            raise InjectedError(f"Injected failure for {agent.name}")
+        return fake_output(agent.output_type, agent_input)
+
+    def _rng_for(self, agent_name: str, agent_input: str) -> random.Random:
+        """
+        Returns the generator of the next attempt of a call.
+        """
+        input_hash = hashlib.sha256(agent_input.encode("utf-8")).hexdigest()
+        attempt = self._attempts.get((agent_name, input_hash), 0)
+        self._attempts[(agent_name, input_hash)] = attempt + 1
+        key = f"{self.seed}:{agent_name}:{input_hash}:{attempt}".encode("utf-8")
+        return random.Random(int.from_bytes(hashlib.sha256(key).digest()[:8], "big"))
+
+    def _latency_for(self, agent_name: str) -> Latency:
+        latency = self.latency
+        if isinstance(latency, dict):
+            latency = latency.get(agent_name, latency.get("*", Latency(0.05)))
+        if not isinstance(latency, Latency):
+            latency = Latency(float(latency))
+        return latency
+
+
+def fake_output(output_type: Any, seed_text: str = "") -> Any:
+    """
+    Builds a canned value that validates against `output_type`.
+
+    Args:
+        output_type: A Pydantic model, a typing construct, a primitive type, or None for text.
+        seed_text: Text mixed into string values so that outputs differ per input.
+
+    Returns:
+        Any: A valid instance of `output_type`.
+    """
+    if output_type is None or output_type is str:
+        return f"# Generated text\n\n{seed_text[:80]}"
+
+    origin = typing.get_origin(output_type)
+    args = typing.get_args(output_type)
+
+    if origin in (list, typing.List):
+        return [fake_output(args[0], seed_text) for _ in range(2)]
+    if origin is typing.Union or type(output_type).__name__ == "UnionType":
+        return fake_output(next(a for a in args if a is not type(None)), seed_text)
+    if isinstance(output_type, type) and issubclass(output_type, BaseModel):
+        return output_type(**{
+            name: fake_output(field_info.annotation, f"{name}: {seed_text}")
+            for name, field_info in output_type.model_fields.items()
+        })
+    if output_type is int:
+        return 1
+    if output_type is float:
+        return 1.0
+    if output_type is bool:
+        return True
+    return None
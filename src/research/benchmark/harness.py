@@ -0,0 +1,103 @@
+import os
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Optional, Union
+
+from research.coordinator import ResearchCoordinator, StepPolicy
+from .corpus import generate_corpus
+from .fake import FakeAgentRunner, Latency
+
+
+@dataclass
+class BenchmarkReport:
+    """
+    Measurements of one offline pipeline run.
+
+    Attributes:
+        papers: Number of papers in the synthetic corpus.
+        pages: Pages per paper.
+        wall_time: Seconds from the start of the run to its end, including PDF extraction.
+        critical_path_time: Total duration of the longest chain of dependent steps.
+        critical_path: Step names on the critical path.
+        scheduler_overhead: Wall time not explained by the critical path, in seconds.
+        peak_memory: Peak memory allocated by Python during the run, in bytes.
+        agent_calls: Number of calls served by the fake runner.
+        failed_calls: Number of injected failures.
+        step_times: Duration of every step, in seconds.
+    """
+    papers: int
+    pages: int
+    wall_time: float
+    critical_path_time: float
+    critical_path: list[str]
+    scheduler_overhead: float
+    peak_memory: int
+    agent_calls: int
+    failed_calls: int
+    step_times: dict[str, float] = field(default_factory=dict)
+
+
+async def run_benchmark(
+    papers: int = 20,
+    pages: int = 8,
+    latency: Union[float, Latency, dict[str, Latency]] = 0.05,
+    error_rate: float = 0.0,
+    seed: int = 0,
+    workdir: Optional[str] = None,
+    **coordinator_options,
+) -> BenchmarkReport:
+    """
+    Runs the research pipeline offline on a synthetic corpus with a fake model backend.
+
+    Args:
+        papers (int): Number of synthetic PDFs to generate.
+        pages (int): Pages per PDF.
+        latency: Latency of the fake agent calls (see FakeAgentRunner).
+        error_rate (float): Fraction of fake agent calls failing with a transient error.
+        seed (int): Seed for the corpus and the fake runner.
+        workdir (str, optional): Folder for the corpus; a temporary folder by default.
+        **coordinator_options: Extra ResearchCoordinator arguments, e.g. `pdf_extractor`
+            or `max_concurrency`. Persistence is disabled unless `output_dir` is given.
+
+    Returns:
+        BenchmarkReport: The measurements of the run.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = os.path.join(workdir or tmp, "papers")
+        generate_corpus(folder, papers, pages, seed)
+
+        runner = FakeAgentRunner(latency=latency, error_rate=error_rate, seed=seed)
+        coordinator_options.setdefault("output_dir", None)
+        if error_rate:
+            coordinator_options.setdefault("step_policy", StepPolicy(retries=5, backoff=0.01))
+        coordinator = ResearchCoordinator(papers_folder=folder, **coordinator_options)
+
+        # Steps with their own runners (chunked summaries, hierarchical synthesis) call
+        # run_agent internally; route those through the fake backend as well
+        coordinator.run_agent = runner
+        pipeline = coordinator._build_pipeline(coordinator.stream_paper_texts())
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            await pipeline.run(runner)
+            wall_time = time.perf_counter() - started
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    critical_path_time, critical_path = pipeline.critical_path()
+    return BenchmarkReport(
+        papers=papers,
+        pages=pages,
+        wall_time=round(wall_time, 4),
+        critical_path_time=round(critical_path_time, 4),
+        critical_path=critical_path,
+        scheduler_overhead=round(max(0.0, wall_time - critical_path_time), 4),
+        peak_memory=peak_memory,
+        agent_calls=len(runner.calls),
+        failed_calls=sum(call.failed for call in runner.calls),
+        step_times={name: round(end - start, 4) for name, (start, end) in pipeline.timings.items()},
+    )
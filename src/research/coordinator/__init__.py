@@ -1,17 +1,56 @@
 from .coordinator import ResearchCoordinator
+from .cache import ResponseCache
+from .sink import OutputSink
+from .artifacts import ArtifactStore, Artifact
+from .checkpoint import RunManifest
+from .limiter import RateLimiter
+from .policy import StepPolicy
+from .routing import ModelRoute, ModelRouter
+from .usage import UsageTracker, UsageRecord, Reservation, BudgetExceededError
+from .tracing import Tracer, Span
+from .compaction import Compaction
+from .batch import BatchRunner, ResearchJob, JobResult, load_jobs
 from .pipeline import (
     AgentStep,
     ParallelAgentStep,
+    BatchItem,
     ParallelGroup,
     PipelineStep,
     Pipeline,
+    BatchReport,
+    BatchFailureError,
+    ItemFailure,
 )
 
 __all__ = [
     "ResearchCoordinator",
+    "ResponseCache",
+    "OutputSink",
+    "ArtifactStore",
+    "Artifact",
+    "RunManifest",
+    "RateLimiter",
+    "StepPolicy",
+    "ModelRoute",
+    "ModelRouter",
+    "UsageTracker",
+    "UsageRecord",
+    "Reservation",
+    "BudgetExceededError",
+    "Tracer",
+    "Span",
+    "Compaction",
+    "BatchRunner",
+    "ResearchJob",
+    "JobResult",
+    "load_jobs",
     "AgentStep",
     "ParallelAgentStep",
+    "BatchItem",
     "ParallelGroup",
     "PipelineStep",
     "Pipeline",
+    "BatchReport",
+    "BatchFailureError",
+    "ItemFailure",
 ]
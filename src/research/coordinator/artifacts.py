@@ -0,0 +1,231 @@
+import hashlib
+import os
+import secrets
+import shutil
+import sqlite3
+import stat
+import time
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+from foundation.files import write_atomic
+
+
+# Permissions of stored objects and of the run files linked to them
+_READ_ONLY = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+
+
+@dataclass
+class Artifact:
+    """
+    An output stored in a run.
+
+    Attributes:
+        run_id: The run that produced the artifact.
+        name: File name of the artifact within the run, e.g. "Abstract Generator Agent.json".
+        sha256: Hex digest of the contents.
+        size: Size of the contents in bytes.
+        path: Location of the artifact file in the run's folder.
+    """
+    run_id: str
+    name: str
+    sha256: str
+    size: int
+    path: str
+
+
+class ArtifactStore:
+    """
+    Run-scoped, content-addressed storage of pipeline outputs.
+
+    Every run writes to its own folder, `{root}/runs/{run_id}/`, so concurrent or
+    successive runs in the same working directory never overwrite each other. Contents
+    are stored once under `{root}/objects/` by SHA-256 and hard-linked into the run
+    folders (copied where links are unsupported), so identical outputs across runs cost
+    no extra space. Objects are read-only, so an editor cannot modify a run's file in
+    place and thereby every run sharing it. All files are written to a temporary name
+    and renamed into place.
+
+    An SQLite index (`{root}/artifacts.db`) records the runs with their status and the
+    artifacts of each run, and `{root}/LATEST` names the last completed run.
+    """
+
+    def __init__(self, root: str = "outputs"):
+        """
+        Initializes the store, creating its folders and index if needed.
+
+        Args:
+            root (str): Folder holding the runs, the objects and the index.
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._db_path = self.root / "artifacts.db"
+        self.run_id: Optional[str] = None
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                "run_id TEXT PRIMARY KEY, started REAL NOT NULL, finished REAL, status TEXT NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS artifacts ("
+                "run_id TEXT NOT NULL, name TEXT NOT NULL, sha256 TEXT NOT NULL, size INTEGER NOT NULL, "
+                "created REAL NOT NULL, PRIMARY KEY (run_id, name))"
+            )
+
+    @property
+    def run_dir(self) -> Path:
+        """
+        Folder of the current run.
+        """
+        if self.run_id is None:
+            raise RuntimeError("No run started; call start_run() first")
+        return self.root / "runs" / self.run_id
+
+    def start_run(self, run_id: Optional[str] = None) -> str:
+        """
+        Starts a new run; subsequent artifacts are stored in it.
+
+        Args:
+            run_id (str, optional): Identifier of the run. Defaults to a timestamp with a random suffix.
+
+        Returns:
+            str: The run identifier.
+        """
+        self.run_id = run_id or f"{time.strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(3)}"
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO runs (run_id, started, finished, status) VALUES (?, ?, NULL, 'running')",
+                (self.run_id, time.time()),
+            )
+        return self.run_id
+
+    def finish_run(self, status: str = "completed") -> None:
+        """
+        Marks the current run as finished. A completed run becomes the one `get` reads by default.
+
+        Args:
+            status (str): Final status of the run, e.g. "completed" or "failed".
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE runs SET finished = ?, status = ? WHERE run_id = ?",
+                (time.time(), status, self.run_id),
+            )
+        if status == "completed":
+            write_atomic(self.root / "LATEST", f"{self.run_id}\n")
+
+    def put(self, name: str, data: Union[bytes, str]) -> Artifact:
+        """
+        Stores an artifact in the current run, replacing any earlier artifact of the same name.
+
+        Safe to call from several threads at once.
+
+        Args:
+            name (str): File name of the artifact, e.g. "usage.json".
+            data: The contents; strings are encoded as UTF-8.
+
+        Returns:
+            Artifact: The stored artifact.
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+
+        blob = self._object_path(digest)
+        if not blob.exists():
+            write_atomic(blob, data)
+        if blob.stat().st_mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH):
+            os.chmod(blob, _READ_ONLY)
+
+        target = self.run_dir / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.parent / f".tmp-{secrets.token_hex(8)}"
+        try:
+            os.link(blob, tmp_path)
+        except OSError:
+            shutil.copyfile(blob, tmp_path)
+        os.replace(tmp_path, target)
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO artifacts (run_id, name, sha256, size, created) VALUES (?, ?, ?, ?, ?)",
+                (self.run_id, name, digest, len(data), time.time()),
+            )
+        return Artifact(run_id=self.run_id, name=name, sha256=digest, size=len(data), path=str(target))
+
+    def get(self, name: str, run_id: Optional[str] = None) -> Optional[bytes]:
+        """
+        Returns the contents of an artifact, verified against its recorded hash.
+
+        Args:
+            name (str): File name of the artifact.
+            run_id (str, optional): Run to read from. Defaults to the latest completed run.
+
+        Returns:
+            bytes | None: The contents, or None if the artifact is missing or corrupted.
+        """
+        run_id = run_id or self.latest_run()
+        if run_id is None:
+            return None
+
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT sha256 FROM artifacts WHERE run_id = ? AND name = ?", (run_id, name)
+            ).fetchone()
+        if row is None:
+            return None
+
+        try:
+            data = self._object_path(row[0]).read_bytes()
+        except OSError:
+            return None
+        return data if hashlib.sha256(data).hexdigest() == row[0] else None
+
+    def latest_run(self, status: str = "completed") -> Optional[str]:
+        """
+        Returns the most recently started run with the given status, if any.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT run_id FROM runs WHERE status = ? ORDER BY started DESC LIMIT 1", (status,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def artifacts(self, run_id: Optional[str] = None) -> list[Artifact]:
+        """
+        Lists the artifacts of a run (the current run by default).
+        """
+        run_id = run_id or self.run_id
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT name, sha256, size FROM artifacts WHERE run_id = ? ORDER BY name", (run_id,)
+            ).fetchall()
+        return [
+            Artifact(run_id=run_id, name=name, sha256=digest, size=size, path=str(self.root / "runs" / run_id / name))
+            for name, digest, size in rows
+        ]
+
+    def runs(self) -> list[dict]:
+        """
+        Lists all runs with their start and finish times and status, oldest first.
+        """
+        with self._connect() as conn:
+            rows = conn.execute("SELECT run_id, started, finished, status FROM runs ORDER BY started").fetchall()
+        return [dict(zip(("run_id", "started", "finished", "status"), row)) for row in rows]
+
+    def _object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / digest
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Opens a short-lived connection that commits on success. Connections are not shared
+        between threads, and concurrent writers wait on SQLite's lock.
+        """
+        with closing(sqlite3.connect(self._db_path, timeout=30)) as conn, conn:
+            yield conn
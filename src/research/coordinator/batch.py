@@ -0,0 +1,220 @@
+import asyncio
+import inspect
+import json
+import logging
+import os
+import time
+import traceback
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from foundation.files import write_atomic
+from .coordinator import ResearchCoordinator
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ResearchJob:
+    """
+    A research topic to run as part of a batch.
+
+    Attributes:
+        name: Unique name of the job; also the name of its output and checkpoint folders.
+        papers_folder: Folder containing the topic's PDF papers.
+        options: Additional `ResearchCoordinator` arguments for this job only,
+            e.g. `{"model": "gpt-4o", "min_success_ratio": 0.8}`.
+    """
+    name: str
+    papers_folder: str
+    options: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class JobResult:
+    """
+    Outcome of a research job.
+
+    Attributes:
+        name: Name of the job.
+        output_dir: Run folder the job's outputs were written to, if persisted.
+        elapsed: Wall-clock seconds the job took.
+        error: Formatted exception if the job failed, otherwise None.
+        usage: Run totals of the job's usage tracker.
+    """
+    name: str
+    output_dir: Optional[str]
+    elapsed: float
+    error: Optional[str] = None
+    usage: dict = field(default_factory=dict)
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+def load_jobs(sources: Iterable[str]) -> list[ResearchJob]:
+    """
+    Builds research jobs from papers folders and topic manifests.
+
+    A folder becomes a job named after the folder. A manifest is a JSON file holding a
+    job object or a list of them, each with a "papers_folder", an optional "name"
+    (defaulting to the folder name) and any other keys passed to the coordinator.
+    Relative papers folders in a manifest are resolved against the manifest's folder.
+
+    Args:
+        sources (Iterable[str]): Paths of papers folders and/or JSON manifest files.
+
+    Returns:
+        list[ResearchJob]: The jobs, in the given order.
+
+    Raises:
+        ValueError: If a manifest entry has no papers folder or an unknown option, or two
+            jobs share a name.
+    """
+    jobs: list[ResearchJob] = []
+    known = set(inspect.signature(ResearchCoordinator).parameters)
+
+    for source in sources:
+        path = Path(source)
+        if path.is_dir():
+            jobs.append(ResearchJob(name=path.resolve().name, papers_folder=str(path)))
+            continue
+
+        with path.open("r", encoding="utf-8") as f:
+            entries = json.load(f)
+
+        for entry in entries if isinstance(entries, list) else [entries]:
+            options = dict(entry)
+            if "papers_folder" not in options:
+                raise ValueError(f"Job in manifest '{source}' has no 'papers_folder': {entry}")
+            folder = path.parent / options.pop("papers_folder")
+            name = options.pop("name", None) or folder.resolve().name
+            unknown = sorted(set(options) - known)
+            if unknown:
+                raise ValueError(f"Job in manifest '{source}' has unknown options {', '.join(unknown)}: {entry}")
+            jobs.append(ResearchJob(name=name, papers_folder=str(folder), options=options))
+
+    names = [job.name for job in jobs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Job names must be unique; duplicated: {', '.join(duplicates)}")
+    return jobs
+
+
+class BatchRunner:
+    """
+    Runs many research jobs concurrently in one process.
+
+    Every job gets its own `ResearchCoordinator` with isolated output (and checkpoint)
+    folders, and all jobs share one run id. The resources passed as shared options —
+    typically the rate limiter, response cache, PDF extractor with its text cache, and
+    model router — are the same objects for all jobs. The shared limiter therefore
+    enforces one provider budget across the whole batch, and identical calls or papers
+    are only processed once. A failing job does not stop the others.
+    """
+
+    def __init__(
+        self,
+        jobs: list[ResearchJob],
+        output_root: str = "outputs",
+        checkpoint_root: Optional[str] = None,
+        max_jobs: Optional[int] = None,
+        run_id: Optional[str] = None,
+        **shared_options,
+    ):
+        """
+        Initializes the batch.
+
+        Args:
+            jobs (list[ResearchJob]): The jobs to run.
+            output_root (str): Folder in which each job has its artifact store, `{output_root}/{job name}`.
+            checkpoint_root (str, optional): Folder in which each job keeps its run manifest in
+                `{checkpoint_root}/{job name}`. None disables checkpointing.
+            max_jobs (int, optional): Maximum number of jobs running at once. None runs all at once.
+            run_id (str, optional): Run id used by every job. Defaults to a timestamp.
+            **shared_options: `ResearchCoordinator` arguments used by every job, e.g.
+                `rate_limiter`, `response_cache`, `pdf_extractor`, `model_router` or `resume`.
+        """
+        self.jobs = jobs
+        self.output_root = output_root
+        self.checkpoint_root = checkpoint_root
+        self.max_jobs = max_jobs
+        self.run_id = run_id or time.strftime("%Y%m%d-%H%M%S")
+        self.shared_options = shared_options
+        self.coordinators: dict[str, ResearchCoordinator] = {}
+
+    def coordinator_for(self, job: ResearchJob) -> ResearchCoordinator:
+        """
+        Creates the coordinator of a job from the shared and job-specific options.
+        """
+        options = {
+            **self.shared_options,
+            "output_dir": os.path.join(self.output_root, job.name),
+            "run_id": self.run_id,
+            "checkpoint_dir": (
+                os.path.join(self.checkpoint_root, job.name) if self.checkpoint_root is not None else None
+            ),
+            **job.options,
+        }
+        return ResearchCoordinator(papers_folder=job.papers_folder, **options)
+
+    async def run(self) -> list[JobResult]:
+        """
+        Runs all jobs and writes a summary to `{output_root}/batch-{run_id}.json`.
+
+        Returns:
+            list[JobResult]: The result of each job, in job order.
+        """
+        semaphore = asyncio.Semaphore(self.max_jobs) if self.max_jobs else None
+        logger.info(f"Batch started: {len(self.jobs)} jobs.")
+
+        async def run_job(job: ResearchJob) -> JobResult:
+            if semaphore is None:
+                return await self._run_job(job)
+            async with semaphore:
+                return await self._run_job(job)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*[run_job(job) for job in self.jobs])
+        elapsed = time.perf_counter() - started
+
+        failed = [result.name for result in results if not result.succeeded]
+        logger.info(
+            f"Batch completed in {elapsed:.1f}s: {len(results) - len(failed)} succeeded, "
+            f"{len(failed)} failed."
+        )
+        if failed:
+            logger.warning(f"Failed jobs: {', '.join(failed)}")
+        self._write_summary(results, elapsed)
+        return results
+
+    async def _run_job(self, job: ResearchJob) -> JobResult:
+        logger.info(f"Job started: {job.name} ({job.papers_folder})")
+
+        started = time.perf_counter()
+        coordinator = None
+        error = None
+        try:
+            coordinator = self.coordinator_for(job)
+            self.coordinators[job.name] = coordinator
+            await coordinator.research()
+        except Exception as e:
+            error = "".join(traceback.format_exception_only(type(e), e)).strip()
+            logger.error(f"Job failed: {job.name}: {error}")
+        else:
+            logger.info(f"Job completed: {job.name}")
+
+        artifacts = coordinator.artifacts if coordinator is not None else None
+        return JobResult(
+            name=job.name,
+            output_dir=str(artifacts.run_dir) if artifacts is not None and artifacts.run_id is not None else None,
+            elapsed=round(time.perf_counter() - started, 3),
+            error=error,
+            usage=coordinator.usage.summary()["run"] if coordinator is not None else {},
+        )
+
+    def _write_summary(self, results: list[JobResult], elapsed: float) -> None:
+        summary = {"run_id": self.run_id, "elapsed": round(elapsed, 3), "jobs": [asdict(result) for result in results]}
+        write_atomic(Path(self.output_root) / f"batch-{self.run_id}.json", json.dumps(summary, indent=2))
@@ -0,0 +1,90 @@
+import json
+from typing import Any, Optional
+
+from foundation.cache import DiskCache
+from .transformers import deserialize_model, output_schema, serialize_model
+
+
+class ResponseCache:
+    """
+    Persistent cache of agent outputs keyed by everything that determines a response:
+    the agent name, its instructions, its output_type schema, the model and the input.
+
+    Cached outputs are stored as JSON and re-validated into the agent's output_type
+    on retrieval, so callers receive the same typed objects as from a live run.
+    """
+
+    def __init__(
+        self,
+        directory: str = ".cache/responses",
+        max_entries: Optional[int] = 10_000,
+        max_bytes: Optional[int] = 512 * 1024 * 1024,
+        max_age: Optional[float] = 30 * 24 * 3600,
+        enabled: bool = True,
+    ):
+        """
+        Initializes the response cache.
+
+        Args:
+            directory (str): Folder in which cached responses are stored.
+            max_entries (int, optional): Maximum number of cached responses.
+            max_bytes (int, optional): Maximum total size of the cache in bytes.
+            max_age (float, optional): Maximum age of a cached response in seconds, counted
+                from when it was stored; reads do not extend it.
+            enabled (bool): When False the cache is bypassed entirely.
+        """
+        self.store = DiskCache(
+            directory,
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            max_age=max_age,
+            enabled=enabled,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.store.enabled
+
+    @enabled.setter
+    def enabled(self, value: bool):
+        self.store.enabled = value
+
+    @property
+    def stats(self) -> dict:
+        return self.store.stats
+
+    def key(self, agent, model: str, agent_input: str) -> str:
+        """
+        Computes the content address of an agent call.
+
+        Args:
+            agent (Agent): The agent being run.
+            model (str): Name of the model used for the call.
+            agent_input (str): The input passed to the agent.
+
+        Returns:
+            str: A SHA-256 hex digest identifying the call.
+        """
+        return DiskCache.make_key(
+            agent.name,
+            agent.instructions if isinstance(agent.instructions, str) else repr(agent.instructions),
+            output_schema(agent.output_type),
+            model,
+            agent_input,
+        )
+
+    def get(self, agent, model: str, agent_input: str) -> Optional[Any]:
+        """
+        Returns the cached output of an identical earlier call, or None.
+        """
+        data = self.store.get(self.key(agent, model, agent_input))
+        if data is None:
+            return None
+        return deserialize_model(agent.output_type, json.loads(data))
+
+    def set(self, agent, model: str, agent_input: str, output: Any) -> None:
+        """
+        Stores the output of an agent call.
+        """
+        data = json.dumps(serialize_model(output), ensure_ascii=False)
+        self.store.set(self.key(agent, model, agent_input), data.encode("utf-8"))
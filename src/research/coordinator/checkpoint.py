@@ -0,0 +1,96 @@
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from foundation.files import write_atomic
+
+
+class RunManifest:
+    """
+    Records completed pipeline steps so that an interrupted run can be resumed.
+
+    For every completed step the manifest stores the hash of its input and the hash
+    of its serialized output; outputs themselves are stored as content-addressed JSON
+    files next to the manifest. A step can be skipped on resume when its input hash is
+    unchanged and its stored output is still present and intact. Batch steps store
+    their outputs per input item, so unchanged items can be reused on their own.
+    """
+
+    def __init__(self, directory: str = ".checkpoints"):
+        """
+        Initializes the manifest, loading previously recorded steps if present.
+
+        Args:
+            directory (str): Folder holding `manifest.json` and the stored outputs.
+        """
+        self.directory = Path(directory)
+        self._manifest_path = self.directory / "manifest.json"
+        self._outputs_dir = self.directory / "outputs"
+        self.steps: dict[str, dict] = self._load()
+
+    @staticmethod
+    def hash(value: Any) -> str:
+        """
+        Returns the SHA-256 hex digest of a JSON-serializable value.
+        """
+        payload = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def lookup(self, step_name: str, input_hash: Optional[str] = None) -> Optional[Any]:
+        """
+        Returns the stored (serialized) output of a step if it completed with the same input.
+
+        Args:
+            step_name (str): Name of the pipeline step.
+            input_hash (str, optional): Hash of the step's current input. When None, the last
+                recorded output is returned regardless of the input it was produced from.
+
+        Returns:
+            Any | None: The serialized output, or None if the step must be re-run.
+        """
+        entry = self.steps.get(step_name)
+        if entry is None or (input_hash is not None and entry["input_hash"] != input_hash):
+            return None
+
+        try:
+            with self._output_path(entry["output_hash"]).open("r", encoding="utf-8") as f:
+                output = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+        return output if self.hash(output) == entry["output_hash"] else None
+
+    def record(self, step_name: str, input_hash: str, output: Any) -> None:
+        """
+        Records the completion of a step.
+
+        Args:
+            step_name (str): Name of the pipeline step.
+            input_hash (str): Hash of the input the step ran on.
+            output (Any): The step's serialized (JSON-compatible) output.
+        """
+        output_hash = self.hash(output)
+        self._write_json(self._output_path(output_hash), output)
+
+        self.steps[step_name] = {
+            "input_hash": input_hash,
+            "output_hash": output_hash,
+            "completed_at": time.time(),
+        }
+        self._write_json(self._manifest_path, {"steps": self.steps})
+
+    def _output_path(self, output_hash: str) -> Path:
+        return self._outputs_dir / f"{output_hash}.json"
+
+    def _load(self) -> dict[str, dict]:
+        try:
+            with self._manifest_path.open("r", encoding="utf-8") as f:
+                return json.load(f).get("steps", {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    @staticmethod
+    def _write_json(path: Path, value: Any) -> None:
+        write_atomic(path, json.dumps(value, ensure_ascii=False))
@@ -0,0 +1,79 @@
+from typing import Optional
+
+
+def cluster_summaries(summaries: list[dict], max_cluster_size: int) -> list[list[dict]]:
+    """
+    Groups paper summaries into clusters of related papers of at most `max_cluster_size`.
+
+    Papers are first grouped by their `domain_track`. Groups larger than the limit are
+    split greedily by keyword similarity, each cluster growing around a seed paper by
+    repeatedly adding the remaining paper whose keywords overlap most with the
+    cluster's. Small leftover groups are then packed together so that no more
+    clusters than necessary are produced.
+
+    Args:
+        summaries (list[dict]): Serialized PaperSummary objects.
+        max_cluster_size (int): Maximum number of summaries per cluster.
+
+    Returns:
+        list[list[dict]]: The clusters, each a list of summaries.
+    """
+    by_domain: dict[str, list[dict]] = {}
+    for summary in summaries:
+        by_domain.setdefault(_normalize(summary.get("domain_track")), []).append(summary)
+
+    clusters: list[list[dict]] = []
+    for group in by_domain.values():
+        clusters.extend(_split_by_keywords(group, max_cluster_size))
+
+    # Pack undersized clusters together, largest first
+    clusters.sort(key=len, reverse=True)
+    packed: list[list[dict]] = []
+    for cluster in clusters:
+        for target in packed:
+            if len(target) + len(cluster) <= max_cluster_size:
+                target.extend(cluster)
+                break
+        else:
+            packed.append(list(cluster))
+    return packed
+
+
+def _split_by_keywords(group: list[dict], max_cluster_size: int) -> list[list[dict]]:
+    """
+    Splits a group of summaries into keyword-coherent clusters of bounded size.
+    """
+    if len(group) <= max_cluster_size:
+        return [group]
+
+    remaining = [(summary, _keywords(summary)) for summary in group]
+    clusters = []
+
+    while remaining:
+        seed, cluster_keywords = remaining.pop(0)
+        cluster = [seed]
+        cluster_keywords = set(cluster_keywords)
+
+        while remaining and len(cluster) < max_cluster_size:
+            best = max(
+                range(len(remaining)),
+                key=lambda i: _jaccard(cluster_keywords, remaining[i][1]),
+            )
+            summary, keywords = remaining.pop(best)
+            cluster.append(summary)
+            cluster_keywords |= keywords
+
+        clusters.append(cluster)
+    return clusters
+
+
+def _keywords(summary: dict) -> set[str]:
+    return {_normalize(k) for k in summary.get("keywords") or []}
+
+
+def _jaccard(a: set[str], b: set[str]) -> float:
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+def _normalize(value: Optional[str]) -> str:
+    return (value or "").strip().lower()
@@ -0,0 +1,198 @@
+import json
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from foundation.text import CHARS_PER_TOKEN, estimate_tokens
+
+# Marker appended to strings shortened by truncation
+ELLIPSIS = "…"
+
+# Shortest length strings are cut to before list items are dropped instead
+MIN_STRING_CHARS = 100
+
+
+@dataclass
+class Compaction:
+    """
+    Describes how an upstream output is reduced before it is passed to an agent.
+
+    Attributes:
+        fields: Dotted paths of the fields to keep, e.g. `["overview", "components.name"]`.
+            Paths apply to every element of a list, so `"title"` selects the title of each
+            summary in a list of summaries. None keeps every field.
+        max_tokens: Estimated token budget of the serialized value. The longest strings are
+            shortened first until the value fits; when that would cut them below `min_chars`,
+            the longest lists are shortened first instead. None disables truncation.
+        drop_empty: Remove None values, empty strings, empty lists and empty objects.
+        min_chars: Shortest useful length of a truncated string.
+    """
+    fields: Optional[list[str]] = None
+    max_tokens: Optional[int] = None
+    drop_empty: bool = True
+    min_chars: int = MIN_STRING_CHARS
+
+    def apply(self, data: Any) -> Any:
+        """
+        Compacts serialized data (as produced by `serialize_model`).
+
+        Args:
+            data: Plain JSON-compatible data.
+
+        Returns:
+            The projected, stripped and truncated data.
+        """
+        if self.fields is not None:
+            data = project(data, self.fields)
+        if self.drop_empty:
+            data = strip_empty(data)
+        if self.max_tokens is not None:
+            data = truncate(data, self.max_tokens, self.min_chars)
+        return data
+
+
+def project(data: Any, fields: list[str]) -> Any:
+    """
+    Keeps only the given dotted field paths of `data`, descending through lists.
+    """
+    tree: dict = {}
+    for path in fields:
+        node = tree
+        for part in path.split("."):
+            node = node.setdefault(part, {})
+
+    def select(value: Any, node: dict) -> Any:
+        if not node:
+            return value
+        if isinstance(value, list):
+            return [select(item, node) for item in value]
+        if isinstance(value, dict):
+            return {key: select(value[key], child) for key, child in node.items() if key in value}
+        return value
+
+    return select(data, tree)
+
+
+def strip_empty(data: Any) -> Any:
+    """
+    Recursively removes None values, empty strings, empty lists and empty objects.
+    """
+    if isinstance(data, dict):
+        stripped = {key: strip_empty(value) for key, value in data.items()}
+        return {key: value for key, value in stripped.items() if not _is_empty(value)}
+    if isinstance(data, list):
+        return [item for item in map(strip_empty, data) if not _is_empty(item)]
+    return data
+
+
+def truncate(data: Any, max_tokens: int, min_chars: int = MIN_STRING_CHARS) -> Any:
+    """
+    Shortens the longest strings of `data` until its JSON serialization fits in
+    `max_tokens` (estimated) tokens.
+
+    All strings longer than a common length limit are cut to that limit, and the limit
+    is chosen as high as the budget allows, so short fields such as titles and names
+    survive intact while long free-text fields share what is left. Strings are cut at
+    a word boundary and marked with an ellipsis.
+
+    When the data holds so many strings that the limit would fall below `min_chars`,
+    items are dropped from the end of the longest lists first (e.g. the references of
+    the papers citing the most works), keeping as many items as allow a limit of at
+    least `min_chars`, before the remaining strings are cut.
+
+    Args:
+        data: Plain JSON-compatible data.
+        max_tokens: Estimated token budget of the serialized data.
+        min_chars: Shortest useful length of a truncated string.
+
+    Returns:
+        The data with shortened strings and lists, or `data` itself if it already fits.
+    """
+    if estimate_tokens(_dumps(data)) <= max_tokens:
+        return data
+
+    limit = _string_limit(data, max_tokens)
+    if limit is not None and limit < min_chars:
+        # Largest number of items per list that leaves strings of at least `min_chars`
+        low, high = 1, _longest_list(data) - 1
+        keep = 1
+        while low <= high:
+            middle = (low + high) // 2
+            middle_limit = _string_limit(_head(data, middle), max_tokens)
+            if middle_limit is None or middle_limit >= min_chars:
+                keep, low = middle, middle + 1
+            else:
+                high = middle - 1
+        data = _head(data, keep)
+        limit = _string_limit(data, max_tokens)
+
+    return data if limit is None else _cut(data, limit)
+
+
+def _string_limit(data: Any, max_tokens: int) -> Optional[int]:
+    """
+    Returns the largest length such that the strings of `data`, each cut to at most that
+    many characters (plus the ellipsis), fit in the budget, or None if no cut is needed.
+    """
+    lengths = sorted(len(s) for s in _strings(data))
+    overhead = len(_dumps(data)) - sum(lengths)
+    available = max(max_tokens * CHARS_PER_TOKEN - overhead, 0)
+
+    shorter = 0
+    for i, length in enumerate(lengths):
+        longer = len(lengths) - i
+        candidate = (available - shorter) // longer - len(ELLIPSIS)
+        if candidate < length:
+            return max(candidate, 0)
+        shorter += length
+    return None
+
+
+def _head(data: Any, keep: int) -> Any:
+    """
+    Keeps the first `keep` items of every list in `data`.
+    """
+    if isinstance(data, dict):
+        return {key: _head(value, keep) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_head(item, keep) for item in data[:keep]]
+    return data
+
+
+def _longest_list(data: Any) -> int:
+    if isinstance(data, dict):
+        return max((_longest_list(value) for value in data.values()), default=0)
+    if isinstance(data, list):
+        return max([len(data)] + [_longest_list(item) for item in data])
+    return 0
+
+
+def _cut(data: Any, limit: int) -> Any:
+    if isinstance(data, dict):
+        return {key: _cut(value, limit) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_cut(item, limit) for item in data]
+    if isinstance(data, str) and len(data) > limit:
+        head = data[:limit]
+        if " " in head and not data[limit].isspace():
+            head = head.rsplit(" ", 1)[0]
+        return head.rstrip() + ELLIPSIS
+    return data
+
+
+def _strings(data: Any):
+    if isinstance(data, dict):
+        for value in data.values():
+            yield from _strings(value)
+    elif isinstance(data, list):
+        for item in data:
+            yield from _strings(item)
+    elif isinstance(data, str):
+        yield data
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or (isinstance(value, (str, list, dict)) and len(value) == 0)
+
+
+def _dumps(data: Any) -> str:
+    return json.dumps(data, ensure_ascii=False)
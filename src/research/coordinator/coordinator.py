@@ -1,13 +1,39 @@
 import os
+import json
+import time
 import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import asdict, replace
+from pathlib import Path
+from typing import AsyncIterator, Callable
+from pydantic import BaseModel
 from agents import Runner, RunConfig, Agent
-from foundation import pdf
+from openai.types.responses import ResponseTextDeltaEvent
+from foundation import dedup, pdf, retrieval, text
 
+from .artifacts import ArtifactStore
+from .cache import ResponseCache
+from .checkpoint import RunManifest
+from .clustering import cluster_summaries
+from .compaction import Compaction
+from .limiter import RateLimiter
+from .policy import StepPolicy, admit
+from .routing import ESCALATION_ERRORS, ModelRouter
+from . import repair
+from .usage import UsageTracker
+from .sink import OutputSink
+from . import tracing
 from .pipeline import *
 from research.agents.response import *
 from research.agents import *
 from .transformers import *
 
+logger = logging.getLogger(__name__)
+
+# Context key of the references parsed from the papers' bibliographies
+EXTRACTED_REFERENCES = "Extracted References"
+
 
 class ResearchCoordinator:
     """
@@ -19,79 +45,611 @@ class ResearchCoordinator:
       generate relevant research questions.
     """
 
-    def __init__(self, papers_folder: str = "papers"):
+    def __init__(
+        self,
+        papers_folder: str = "papers",
+        max_concurrency: int | None = None,
+        model: str = "gpt-4o-mini",
+        model_router: ModelRouter | None = None,
+        response_cache: ResponseCache | None = None,
+        pdf_extractor: pdf.PdfExtractor | None = None,
+        chunk_tokens: int | None = 12_000,
+        synthesis_fanout: int | None = 25,
+        output_dir: str | None = "outputs",
+        run_id: str | None = None,
+        checkpoint_dir: str | None = None,
+        resume: bool = False,
+        rate_limiter: RateLimiter | None = None,
+        output_token_estimate: int = 1_000,
+        step_policy: StepPolicy | None = None,
+        step_policies: dict[str, StepPolicy] | None = None,
+        min_success_ratio: float | None = None,
+        item_retries: int = 1,
+        stream_paper: bool = False,
+        on_paper_text: Callable[[str], None] | None = None,
+        usage: UsageTracker | None = None,
+        compact_inputs: bool = True,
+        dedup_threshold: float | None = 0.8,
+        retrieval_k: int | None = 5,
+        passage_tokens: int = 300,
+        repair_attempts: int = 1,
+    ):
         """
         Initializes the ResearchCoordinator.
 
         Args:
             papers_folder (str): Path to the folder containing research papers in PDF format.
+            max_concurrency (int | None): Maximum number of pipeline steps running at once.
+                None lets every step start as soon as its inputs are ready.
+            model (str): Model used to run the agents that have no route in `model_router`.
+            model_router (ModelRouter | None): Routing table assigning a model, or a cheap-first
+                cascade of models, to each agent. Defaults to `model` for every agent.
+            response_cache (ResponseCache | None): Optional cache of agent responses. Identical
+                calls (same agent, instructions, output schema, model and input) are served from it.
+            pdf_extractor (PdfExtractor | None): Extractor used to read the papers, carrying the
+                worker count, thread or process mode, optional text cache and preprocessor.
+                Defaults to thread-based extraction without caching or preprocessing. References
+                extracted by its preprocessor are passed to the reference generator.
+            chunk_tokens (int | None): Papers longer than this (estimated) token count are split
+                into section-aware chunks that are summarized concurrently and then merged.
+                None always summarizes the full text in a single call.
+            synthesis_fanout (int | None): Maximum number of paper summaries (or partial results)
+                given to a cross-paper agent in one call. Larger corpora are clustered and
+                synthesized hierarchically. None always sends every summary in a single call.
+            output_dir (str | None): Root of the artifact store to which agent outputs are persisted
+                in the background. Each run writes atomically to `{output_dir}/runs/{run_id}/`,
+                indexed in `{output_dir}/artifacts.db`. Steps exchange outputs in memory either
+                way; None disables persistence.
+            run_id (str | None): Identifier of the run's artifact namespace. Defaults to a
+                timestamp with a random suffix, new for every `research()` call.
+            checkpoint_dir (str | None): Folder of the run manifest recording each completed step.
+                None disables checkpointing.
+            resume (bool): Skip steps recorded in the run manifest whose inputs are unchanged.
+            rate_limiter (RateLimiter | None): Admission controller wrapped around every model request.
+                May be shared between coordinators to enforce a common budget.
+            output_token_estimate (int): Tokens reserved for each response when estimating the
+                cost of a request against the limiter's token budget.
+            step_policy (StepPolicy | None): Default timeout, retry and hedging policy for every step.
+            step_policies (dict[str, StepPolicy] | None): Policies for individual steps by step name,
+                overriding `step_policy`.
+            min_success_ratio (float | None): When set, papers whose summary fails are retried in
+                isolation and then skipped, as long as at least this fraction of papers succeeds.
+                None fails the run on the first failed paper. Skipped papers are listed by file name
+                in the run's `failures.json`.
+            item_retries (int): Isolated retry rounds for failed papers when `min_success_ratio` is set.
+            stream_paper (bool): Stream the "Write Paper" step, writing the markdown to the output
+                folder (and `on_paper_text`) incrementally as tokens arrive.
+            on_paper_text (Callable[[str], None] | None): Called with each chunk of paper text
+                as it is generated when `stream_paper` is enabled.
+            usage (UsageTracker | None): Tracker recording tokens, latency and cost of every call,
+                optionally with a hard budget. A report is stored as the run's `usage.json`.
+            compact_inputs (bool): Pass downstream agents only the fields of upstream outputs they
+                need, without empty values and with long texts truncated to a per-input token
+                budget. False passes every upstream output in full.
+            dedup_threshold (float | None): Papers whose estimated text similarity (MinHash
+                Jaccard) to another paper reaches this value are near-duplicates, e.g. a preprint
+                and its camera-ready version; only the one with the first file name is summarized.
+                Skipped papers are listed in the run's `duplicates.json`. None summarizes every paper.
+            retrieval_k (int | None): Number of paper passages retrieved with BM25 for the
+                methodology, experiment and reference steps, based on their hypotheses or
+                questions. The passage index is built as papers are extracted. None disables retrieval.
+            passage_tokens (int): Maximum estimated token count of an indexed passage.
+            repair_attempts (int): When a structured response fails validation, the model is asked
+                up to this many times to fix only the invalid fields, which are merged into the
+                partial response, before the call escalates or fails. 0 disables repairs.
         """
         self.papers_folder = papers_folder
+        self.max_concurrency = max_concurrency
+        self.model_router = model_router or ModelRouter(default=model)
+        self.response_cache = response_cache
+        self.pdf_extractor = pdf_extractor or pdf.PdfExtractor()
+        self.chunk_tokens = chunk_tokens
+        self.synthesis_fanout = synthesis_fanout
+        self.output_dir = output_dir
+        self.run_id = run_id
+        self.artifacts = ArtifactStore(output_dir) if output_dir is not None else None
+        self.output_sink = OutputSink(self.artifacts) if self.artifacts is not None else None
+        self.checkpoint_dir = checkpoint_dir
+        self.resume = resume
+        self.rate_limiter = rate_limiter
+        self.output_token_estimate = output_token_estimate
+        self.step_policy = step_policy
+        self.step_policies = step_policies or {}
+        self.min_success_ratio = min_success_ratio
+        self.item_retries = item_retries
+        self.batch_reports: dict[str, BatchReport] = {}
+        self.stream_paper = stream_paper
+        self.on_paper_text = on_paper_text
+        self.usage = usage or UsageTracker()
+        self.compact_inputs = compact_inputs
+        self.paper_references: dict[str, list[str]] = {}
+        self.dedup_threshold = dedup_threshold
+        self.duplicates: list[dedup.Duplicate] = []
+        self.retrieval_k = retrieval_k
+        self.passage_tokens = passage_tokens
+        self.passage_index = retrieval.BM25Index()
+        self.repair_attempts = repair_attempts
 
     async def run_agent(self, agent, agent_input: str):
         """
-        Runs a given agent asynchronously using a predefined model configuration.
+        Runs a given agent asynchronously on the model(s) routed to it.
+
+        If the route is a cascade, the models are tried in order and the call escalates to
+        the next model only when the output fails structured `output_type` validation or the
+        route's confidence check.
+
+        Args:
+            agent (Agent): The agent instance to be executed.
+            agent_input (str): Input data to feed into the agent.
+
+        Returns:
+            Any: The final output from the agent.
+        """
+        route = self.model_router.route(agent)
+
+        for position, model in enumerate(route.models):
+            is_last = position == len(route.models) - 1
+            try:
+                output = await self._run_on_model(agent, agent_input, model)
+            except ESCALATION_ERRORS as e:
+                if is_last:
+                    raise
+                logger.info(f"{agent.name}: escalating from {model} after invalid output ({e})")
+                continue
+
+            if is_last or route.confidence_check is None or route.confidence_check(output):
+                return output
+            logger.info(f"{agent.name}: escalating from {model} after failed confidence check")
+
+    async def _run_on_model(self, agent, agent_input: str, model: str):
+        """
+        Runs an agent on a specific model. Responses are served from and stored in the
+        response cache when one is configured, and requests to the model are admitted
+        through the rate limiter. A structured response failing validation is repaired
+        field by field when possible (see `_repair_output`).
 
         Args:
             agent (Agent): The agent instance to be executed.
             agent_input (str): Input data to feed into the agent.
+            model (str): Name of the model to run the agent with.
 
         Returns:
             Any: The final output from the agent.
         """
-        config = RunConfig(model="gpt-4o-mini")
-        result = await Runner.run(agent, agent_input, run_config=config)
+        if self.response_cache is not None:
+            cached = self.response_cache.get(agent, model, agent_input)
+            if cached is not None:
+                self.usage.record(agent.name, model, cached=True)
+                return cached
+
+        config = RunConfig(model=model)
+        waiting = time.perf_counter()
+        async with self._admit(agent, agent_input, model) as reservation:
+            started = time.perf_counter()
+            tracing.add_span("admission", tracing.QUEUE, waiting, started, agent=agent.name)
+            try:
+                with tracing.span(agent.name, tracing.LLM, model=model):
+                    result = await Runner.run(agent, agent_input, run_config=config)
+            except ESCALATION_ERRORS as e:
+                invalid = e
+                if getattr(e, "run_data", None) is not None:
+                    self._record_usage(agent, model, e.run_data, time.perf_counter() - started, reservation)
+            else:
+                invalid = None
+                output = result.final_output
+                self._record_usage(agent, model, result, time.perf_counter() - started, reservation)
+
+        if invalid is not None:
+            output = await self._repair_output(agent, model, invalid)
+
+        if self.response_cache is not None:
+            self.response_cache.set(agent, model, agent_input, output)
+
+        return output
+
+    async def _repair_output(self, agent, model: str, error: Exception):
+        """
+        Repairs a structured response that failed validation by asking the model, through
+        the agent's repair agent, only for the invalid fields, given the validation errors
+        and the partial response. The fixes are merged into the partial response, which is
+        validated again, up to `repair_attempts` times.
+
+        Args:
+            agent (Agent): The agent whose response failed validation.
+            model (str): The model the response was generated with; the repair uses it too.
+            error (Exception): The validation error raised by the run.
+
+        Returns:
+            Any: The repaired output.
+
+        Raises:
+            Exception: `error`, if the response cannot be repaired.
+        """
+        output_type = agent.output_type
+        if (
+            self.repair_attempts <= 0
+            or not (isinstance(output_type, type) and issubclass(output_type, BaseModel))
+            or output_type is OutputRepair
+        ):
+            raise error
+
+        raw = repair.raw_output(error)
+        data = repair.parse_partial(raw) if raw is not None else None
+        if not isinstance(data, dict):
+            raise error
+
+        repair_agent = output_repair_agent(agent)
+        for attempt in range(1, self.repair_attempts + 1):
+            output, invalid = repair.validate(output_type, data)
+            if invalid is None:
+                return output
+
+            repair_input, paths = repair.repair_input(output_type, data, invalid)
+            logger.info(
+                f"{agent.name}: repairing {', '.join(repair.dotted(path) or '<root>' for path in paths)} "
+                f"({invalid.error_count()} error(s)), attempt {attempt}"
+            )
+            try:
+                fixes = await self._run_on_model(repair_agent, repair_input, model)
+            except ESCALATION_ERRORS:
+                break
+            data = repair.apply_fixes(data, fixes, paths)
+
+        output, invalid = repair.validate(output_type, data)
+        if invalid is None:
+            logger.info(f"{agent.name}: repaired invalid output")
+            return output
+        logger.info(f"{agent.name}: repair failed ({invalid.error_count()} error(s) left)")
+        raise error
+
+    async def stream_agent(self, agent, agent_input: str, on_text: Callable[[str], None]) -> str:
+        """
+        Runs a plain-text agent with the SDK's streamed run, passing each chunk of generated
+        text to `on_text` as it arrives.
+
+        The first model of the agent's route is used; streamed runs do not cascade. A cached
+        response is passed to `on_text` in one piece.
+
+        Args:
+            agent (Agent): The agent instance to be executed. Must not declare an output_type.
+            agent_input (str): Input data to feed into the agent.
+            on_text (Callable[[str], None]): Receives the generated text incrementally.
+
+        Returns:
+            str: The complete generated text.
+        """
+        model = self.model_router.route(agent).models[0]
+
+        if self.response_cache is not None:
+            cached = self.response_cache.get(agent, model, agent_input)
+            if cached is not None:
+                self.usage.record(agent.name, model, cached=True)
+                on_text(cached)
+                return cached
+
+        config = RunConfig(model=model)
+        waiting = time.perf_counter()
+        async with self._admit(agent, agent_input, model) as reservation:
+            started = time.perf_counter()
+            tracing.add_span("admission", tracing.QUEUE, waiting, started, agent=agent.name)
+            with tracing.span(agent.name, tracing.LLM, model=model, streamed=True):
+                result = Runner.run_streamed(agent, agent_input, run_config=config)
+                async for event in result.stream_events():
+                    if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                        on_text(event.data.delta)
+            self._record_usage(agent, model, result, time.perf_counter() - started, reservation)
+
+        if self.response_cache is not None:
+            self.response_cache.set(agent, model, agent_input, result.final_output)
+
         return result.final_output
 
-    async def load_paper_texts(self) -> list[str]:
+    async def write_paper(self, agent, agent_input: str) -> str:
+        """
+        Streams the paper writer's markdown into `{agent.name}.md.partial` in the run's
+        folder and to `on_paper_text` as it is generated. The partial file is removed once
+        the paper is complete; the final paper is stored by the step's output transformer.
+
+        Args:
+            agent (Agent): The paper writer agent.
+            agent_input (str): JSON of all the paper components.
+
+        Returns:
+            str: The complete paper in markdown.
+        """
+        if self.artifacts is None or self.artifacts.run_id is None:
+            return await self.stream_agent(agent, agent_input, self.on_paper_text or (lambda _: None))
+
+        path = Path(self.artifacts.run_dir, f"{agent.name}.md.partial")
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with path.open("w", encoding="utf-8") as f:
+            def on_text(delta: str):
+                f.write(delta)
+                f.flush()
+                if self.on_paper_text is not None:
+                    self.on_paper_text(delta)
+
+            paper = await self.stream_agent(agent, agent_input, on_text)
+        path.unlink()
+        return paper
+
+    @asynccontextmanager
+    async def _admit(self, agent, agent_input: str, model: str):
+        """
+        Reserves the usage budget for a request and admits it through the rate limiter,
+        both estimated from its prompt size. The reservation is released when the request
+        ends, whether or not its usage was recorded. Time spent waiting for the limiter is
+        left out of the step policy's timeout and latencies.
+
+        Yields:
+            Reservation: The request's budget reservation, to be passed to `_record_usage`.
+
+        Raises:
+            BudgetExceededError: If the request could take the run over its budget.
+        """
+        instructions = agent.instructions if isinstance(agent.instructions, str) else ""
+        input_tokens = text.estimate_tokens(instructions) + text.estimate_tokens(agent_input)
+        reservation = self.usage.reserve(model, input_tokens, self.output_token_estimate)
+
+        try:
+            if self.rate_limiter is None:
+                yield reservation
+            else:
+                async with admit(self.rate_limiter.acquire(input_tokens + self.output_token_estimate)):
+                    yield reservation
+        finally:
+            self.usage.release(reservation)
+
+    def _record_usage(self, agent, model: str, result, latency: float, reservation=None) -> None:
+        """
+        Records the token usage reported for a completed run, in place of its budget reservation.
+        """
+        usage = result.context_wrapper.usage
+        self.usage.record(
+            agent.name,
+            model,
+            input_tokens=usage.input_tokens,
+            output_tokens=usage.output_tokens,
+            latency=latency,
+            reservation=reservation,
+        )
+
+    async def summarize_paper(self, agent, paper_text: str):
         """
-        Loads and reads all PDF files from the `papers_folder`, extracting text from each.
+        Summarizes a single paper, using map-reduce over chunks when it is too long
+        for a single call.
+
+        Short papers are passed to `agent` unchanged. Longer ones are split into
+        section-aware chunks of at most `chunk_tokens` tokens, each chunk is summarized
+        concurrently by the chunk summarizer, and the partial summaries are merged into
+        one PaperSummary by the summary reducer.
+
+        Args:
+            agent (Agent): The agent used for papers that fit in a single call.
+            paper_text (str): The full extracted text of the paper.
 
         Returns:
-            list[str]: A list of paper texts extracted from the PDFs.
+            PaperSummary: The structured summary of the paper.
         """
-        paths = [
+        if self.chunk_tokens is None or text.estimate_tokens(paper_text) <= self.chunk_tokens:
+            return await self.run_agent(agent, paper_text)
+
+        chunks = text.chunk_text(paper_text, self.chunk_tokens)
+        partial_summaries = await asyncio.gather(*[
+            self.run_agent(chunk_summarizer_agent, f"Excerpt {i} of {len(chunks)}:\n\n{chunk}")
+            for i, chunk in enumerate(chunks, start=1)
+        ])
+        reducer_input = json.dumps(serialize_model(partial_summaries), ensure_ascii=False)
+        return await self.run_agent(summary_reducer_agent, reducer_input)
+
+    async def synthesize(self, agent, agent_input: str):
+        """
+        Runs a cross-paper agent over the paper summaries, hierarchically for large corpora.
+
+        The input is the JSON produced by the step's input transformer, with the paper
+        summaries under the "summaries" key. If there are more summaries than
+        `synthesis_fanout`, they are clustered by domain and keywords, `agent` runs on
+        each cluster concurrently, and the partial results are merged by the agent's
+        synthesis merger, `synthesis_fanout` at a time, until a single result remains.
+
+        Args:
+            agent (Agent): The cross-paper agent, e.g. the related work or gap identifier agent.
+            agent_input (str): JSON object containing the "summaries" list.
+
+        Returns:
+            Any: The final output of the agent for the whole corpus.
+        """
+        payload = json.loads(agent_input)
+        summaries = payload.get("summaries") or []
+        fanout = self.synthesis_fanout
+
+        if fanout is None or len(summaries) <= fanout:
+            return await self.run_agent(agent, agent_input)
+
+        results = await asyncio.gather(*[
+            self.run_agent(agent, json.dumps({**payload, "summaries": cluster}, ensure_ascii=False))
+            for cluster in cluster_summaries(summaries, fanout)
+        ])
+
+        merger = synthesis_merger_agent(agent)
+        while len(results) > 1:
+            groups = [results[i:i + fanout] for i in range(0, len(results), fanout)]
+            results = await asyncio.gather(*[
+                self.run_agent(
+                    merger,
+                    json.dumps({"partial_results": serialize_model(group)}, ensure_ascii=False),
+                )
+                for group in groups
+            ])
+        return results[0]
+
+    async def stream_paper_texts(self) -> AsyncIterator[BatchItem]:
+        """
+        Extracts the PDF files in `papers_folder` concurrently, yielding each paper's text,
+        labeled with its file name, as soon as it has been extracted. References parsed from
+        the papers' bibliographies are collected in `paper_references`, keyed by file name and
+        sorted by it once all papers are extracted, so the References step input does not
+        depend on extraction order.
+
+        Near-duplicates are detected online, and of several versions of a paper the one with
+        the first file name is kept whatever the extraction order. A version already yielded
+        when a version with an earlier name arrives is withdrawn, and its summary cancelled.
+        Once all papers are extracted, the passages of the kept papers are added to
+        `passage_index` for retrieval, in file name order.
+
+        Yields:
+            BatchItem: The file name and text of each paper, in completion order.
+        """
+        index = self._dedup_index()
+        items: dict[str, BatchItem] = {}
+        passages: dict[str, tuple[list[str], list[dict[str, int]]]] = {}
+
+        async for path, paper in self.pdf_extractor.iter_read_papers(self._paper_paths()):
+            name = os.path.basename(path)
+            duplicate = await self._check_duplicate(index, name, paper.text)
+            if duplicate is not None and duplicate.key == name:
+                continue
+            if duplicate is not None:
+                items.pop(duplicate.key).withdrawn = True
+                passages.pop(duplicate.key, None)
+                self.paper_references.pop(duplicate.key, None)
+
+            if self.retrieval_k is not None:
+                passages[name] = await asyncio.to_thread(
+                    retrieval.paper_passages, path, paper.text, self.passage_tokens, self.pdf_extractor.cache
+                )
+            if paper.references:
+                self.paper_references[name] = paper.references
+            items[name] = BatchItem(label=name, input=paper.text)
+            yield items[name]
+
+        for name in sorted(passages):
+            self.passage_index.add(name, *passages[name])
+        ordered = sorted(self.paper_references.items())
+        self.paper_references.clear()
+        self.paper_references.update(ordered)
+
+    def _paper_paths(self) -> list[str]:
+        """
+        Returns the paths of all PDF files in `papers_folder`, sorted by file name.
+        """
+        return [
             os.path.join(self.papers_folder, f)
-            for f in os.listdir(self.papers_folder)
+            for f in sorted(os.listdir(self.papers_folder))
             if f.endswith(".pdf")
         ]
-        return await asyncio.gather(
-            *[asyncio.to_thread(pdf.read_pdf, path) for path in paths]
+
+    def _dedup_index(self) -> dedup.NearDuplicateIndex | None:
+        if self.dedup_threshold is None:
+            return None
+        return dedup.NearDuplicateIndex(threshold=self.dedup_threshold)
+
+    async def _check_duplicate(
+        self, index: dedup.NearDuplicateIndex | None, name: str, paper_text: str
+    ) -> dedup.Duplicate | None:
+        """
+        Adds a paper to the near-duplicate index, recording and logging the dropped paper
+        if it duplicates another one.
+        """
+        if index is None:
+            return None
+        duplicate = await asyncio.to_thread(index.add, name, paper_text)
+        if duplicate is None:
+            return None
+        logger.info(
+            f"Skipping {duplicate.key}: near-duplicate of {duplicate.kept} (similarity {duplicate.similarity})"
         )
+        self.duplicates.append(duplicate)
+        return duplicate
 
     async def research(self) -> dict:
         """
         Executes the full research analysis pipeline:
-        - Loads papers
-        - Builds the processing pipeline
-        - Runs the pipeline with agent execution
+        - Builds the processing pipeline over a stream of papers
+        - Runs the pipeline with agent execution, summarizing each paper as soon as it is extracted
 
         Returns:
-            dict: The final output from the pipeline containing results of all processing steps.
+            dict: The pipeline context, mapping each agent name to its typed output.
         """
-        paper_texts = await self.load_paper_texts()
-        pipeline = self._build_pipeline(paper_texts)
-        return await pipeline.run(self.run_agent)
+        self.paper_references.clear()
+        self.duplicates.clear()
+        self.passage_index = retrieval.BM25Index()
+        if self.artifacts is not None:
+            run_id = self.artifacts.start_run(self.run_id)
+            logger.info(f"Writing outputs to {self.artifacts.run_dir} (run {run_id})")
+
+        pipeline = self._build_pipeline(self.stream_paper_texts())
+        status = "failed"
+        try:
+            results = await pipeline.run(self.run_agent)
+            status = "completed"
+        finally:
+            self.batch_reports = pipeline.reports
+            if self.output_sink is not None:
+                try:
+                    if any(report.failures for report in self.batch_reports.values()):
+                        self.output_sink.write(
+                            "failures", "json", [asdict(report) for report in self.batch_reports.values()]
+                        )
+                    if self.duplicates:
+                        self.output_sink.write(
+                            "duplicates", "json", [asdict(d) for d in sorted(self.duplicates, key=lambda d: d.key)]
+                        )
+                    self.output_sink.write("usage", "json", self.usage.report())
+                    self.output_sink.write("trace", "json", pipeline.tracer.chrome_trace())
+                    await self.output_sink.flush()
+                except BaseException:
+                    status = "failed"
+                    raise
+                finally:
+                    self.artifacts.finish_run(status)
+
+        run_usage = self.usage.summary()["run"]
+        logger.info(
+            f"Usage: {run_usage['calls']} calls, {run_usage['input_tokens']} input and "
+            f"{run_usage['output_tokens']} output tokens, ${run_usage['cost']:.4f}"
+        )
+
+        if self.response_cache is not None:
+            logger.info(f"Response cache: {self.response_cache.stats}")
+
+        return results
 
-    def _build_pipeline(self, paper_texts: list[str]) -> Pipeline:
+    def _build_pipeline(
+        self, paper_texts: list[str | BatchItem] | AsyncIterator[str | BatchItem]
+    ) -> Pipeline:
         """
         Constructs the processing pipeline for analyzing multiple research papers.
         Internally used by the coordinator.
 
         Args:
-            paper_texts (list[str]): A list of raw paper texts.
+            paper_texts (list[str | BatchItem] | AsyncIterator[str | BatchItem]): The paper texts,
+                optionally labeled with their file names, either as a list or as a stream consumed
+                by the "Paper Summary" step as papers are extracted.
 
         Returns:
             Pipeline: A configured Pipeline instance ready to run.
         """
-        pipeline = Pipeline()
+        pipeline = Pipeline(
+            context={EXTRACTED_REFERENCES: self.paper_references},
+            max_concurrency=self.max_concurrency,
+            manifest=RunManifest(self.checkpoint_dir) if self.checkpoint_dir is not None else None,
+            resume=self.resume,
+            call_settings=self._call_settings,
+        )
 
         pipeline.add_step(
             ParallelAgentStep(
                 name="Paper Summary",
                 agent=paper_summarizer_agent,
                 input_transformer=lambda ctx: paper_texts,
-                output_transformer=output_transformer(paper_summarizer_agent.name),
+                output_transformer=output_transformer(paper_summarizer_agent.name, sink=self.output_sink),
+                depends_on=[],
+                agent_runner=self.summarize_paper,
+                policy=self._policy_for("Paper Summary"),
+                min_success_ratio=self.min_success_ratio,
+                item_retries=self.item_retries,
             )
         )
 
@@ -102,11 +660,25 @@ class ResearchCoordinator:
                     self._make_agent_step(
                         "Related Work",
                         related_work_agent,
+                        agent_runner=self.synthesize,
+                        compaction={
+                            "summaries": Compaction(fields=[
+                                "title", "abstract", "keywords", "key_contributions",
+                                "methodology", "results_summary", "limitations", "domain_track",
+                            ]),
+                        },
                         summaries=paper_summarizer_agent.name,
                     ),
                     self._make_agent_step(
                         "Gap Identification",
                         gap_identifier_agent,
+                        agent_runner=self.synthesize,
+                        compaction={
+                            "summaries": Compaction(fields=[
+                                "title", "keywords", "key_contributions", "methodology",
+                                "results_summary", "limitations", "domain_track",
+                            ]),
+                        },
                         summaries=paper_summarizer_agent.name,
                     ),
                 ],
@@ -117,6 +689,10 @@ class ResearchCoordinator:
             self._make_agent_step(
                 "Research Questions",
                 research_question_agent,
+                compaction={
+                    "related_work": Compaction(max_tokens=1_500),
+                    "gaps": Compaction(max_tokens=1_000),
+                },
                 related_work=related_work_agent.name,
                 gaps=gap_identifier_agent.name,
             )
@@ -126,6 +702,10 @@ class ResearchCoordinator:
             self._make_agent_step(
                 "Hypotheses",
                 hypothesis_generator_agent,
+                compaction={
+                    "related_work": Compaction(max_tokens=800),
+                    "gaps": Compaction(max_tokens=800),
+                },
                 questions=research_question_agent.name,
                 related_work=related_work_agent.name,
                 gaps=gap_identifier_agent.name
@@ -136,6 +716,7 @@ class ResearchCoordinator:
             self._make_agent_step(
                 "Methodology",
                 methodology_planner_agent,
+                retrieval_query=["hypotheses"],
                 hypotheses=hypothesis_generator_agent.name
             )
         )
@@ -144,6 +725,10 @@ class ResearchCoordinator:
             self._make_agent_step(
                 "SystemDesign",
                 system_design_agent,
+                compaction={
+                    "methodology": Compaction(max_tokens=2_000),
+                    "hypotheses": Compaction(fields=["hypotheses.hypothesis"]),
+                },
                 methodology=methodology_planner_agent.name,
                 hypotheses=hypothesis_generator_agent.name
             )
@@ -153,6 +738,16 @@ class ResearchCoordinator:
             self._make_agent_step(
                 "Experiments",
                 experiment_conductor_agent,
+                compaction={
+                    "system_design": Compaction(
+                        fields=["overview", "components.name", "components.description"],
+                        max_tokens=1_000,
+                    ),
+                    "hypotheses": Compaction(fields=["hypotheses.question", "hypotheses.hypothesis"]),
+                    "related_work": Compaction(max_tokens=500),
+                    "gaps": Compaction(max_tokens=500),
+                },
+                retrieval_query=["hypotheses", "system_design"],
                 system_design=system_design_agent.name,
                 hypotheses=hypothesis_generator_agent.name,
                 related_work=related_work_agent.name,
@@ -164,6 +759,10 @@ class ResearchCoordinator:
             self._make_agent_step(
                 "ResultsAnalysis",
                 results_analyzer_agent,
+                compaction={
+                    "hypotheses": Compaction(fields=["hypotheses.hypothesis"]),
+                    "system_design": Compaction(fields=["overview", "components.name"], max_tokens=500),
+                },
                 hypotheses=hypothesis_generator_agent.name,
                 system_design=system_design_agent.name,
                 experiment_results=experiment_conductor_agent.name
@@ -174,6 +773,13 @@ class ResearchCoordinator:
             self._make_agent_step(
                 "Abstract",
                 abstract_generator_agent,
+                compaction={
+                    "system_design": Compaction(fields=["overview"], max_tokens=400),
+                    "results": Compaction(
+                        fields=["experiments.hypothesis", "experiments.objective", "experiments.expected_outcome"],
+                        max_tokens=1_000,
+                    ),
+                },
                 questions=research_question_agent.name,
                 system_design=system_design_agent.name,
                 results=experiment_conductor_agent.name
@@ -181,13 +787,21 @@ class ResearchCoordinator:
         )
 
         pipeline.add_step(
-        self._make_agent_step(
+            self._make_agent_step(
                 "References",
                 reference_generator_agent,
+                compaction={
+                    "summary": Compaction(fields=["title", "domain_track", "referenced_works"]),
+                    "extracted_references": Compaction(max_tokens=4_000),
+                    "related_work": Compaction(max_tokens=1_000),
+                    "gaps": Compaction(max_tokens=400),
+                },
+                retrieval_query=["questions", "gaps"],
                 summary=paper_summarizer_agent.name,
                 related_work=related_work_agent.name,
                 gaps=gap_identifier_agent.name,
-                questions=research_question_agent.name
+                questions=research_question_agent.name,
+                extracted_references=EXTRACTED_REFERENCES,
             )
         )
 
@@ -196,6 +810,21 @@ class ResearchCoordinator:
                 "Write Paper",
                 paper_writer_agent,
                 output_format="md",
+                agent_runner=self.write_paper if self.stream_paper else None,
+                compaction={
+                    "related_work": Compaction(max_tokens=2_000),
+                    "research_gaps": Compaction(max_tokens=1_000),
+                    "hypotheses": Compaction(fields=["hypotheses.hypothesis", "hypotheses.rationale"]),
+                    "methodology": Compaction(max_tokens=2_000),
+                    "experiments": Compaction(
+                        fields=[
+                            "experiments.hypothesis", "experiments.objective",
+                            "experiments.method", "experiments.expected_outcome",
+                        ],
+                        max_tokens=2_000,
+                    ),
+                    "results_analysis": Compaction(max_tokens=2_000),
+                },
                 abstract=abstract_generator_agent.name,
                 related_work=related_work_agent.name,
                 research_gaps=gap_identifier_agent.name,
@@ -210,7 +839,16 @@ class ResearchCoordinator:
 
         return pipeline
 
-    def _make_agent_step(self, name: str, agent: Agent, output_format="json", **input_sources) -> AgentStep:
+    def _make_agent_step(
+        self,
+        name: str,
+        agent: Agent,
+        output_format="json",
+        agent_runner=None,
+        compaction: dict[str, Compaction] | None = None,
+        retrieval_query: list[str] | None = None,
+        **input_sources,
+    ) -> AgentStep:
         """
         Creates a configured AgentStep for a given agent with transformed input and output.
 
@@ -218,15 +856,57 @@ class ResearchCoordinator:
             name (str): The name of the step in the pipeline.
             agent (Agent): The agent instance to execute for this step.
             output_format (str, optional): Format to parse the agent's output (e.g., "json", "text"). Defaults to "json".
+            agent_runner (Callable, optional): Async function used instead of `run_agent` for this step.
+            compaction (dict[str, Compaction], optional): Field projection and token budget per input
+                key, applied when `compact_inputs` is enabled.
+            retrieval_query (list[str], optional): Input keys whose text is used to retrieve the
+                `retrieval_k` most relevant paper passages, added to the input as "passages".
             **input_sources: Keyword arguments mapping input field names to the names of previous steps
-                            whose outputs will be passed as inputs to this agent.
+                            whose outputs will be passed as inputs to this agent. These also become
+                            the step's dependencies, so it starts as soon as they have completed.
 
         Returns:
             AgentStep: A fully initialized step with input and output transformers ready for pipeline execution.
         """
+        transformer = input_transformer(
+            compaction=(compaction or {}) if self.compact_inputs else None, **input_sources
+        )
+        if retrieval_query and self.retrieval_k is not None:
+            transformer = with_passages(transformer, lambda: self.passage_index, retrieval_query, self.retrieval_k)
+
         return AgentStep(
             name=name,
             agent=agent,
-            input_transformer=input_transformer(**input_sources),
-            output_transformer=output_transformer(agent.name, output_format=output_format),
+            input_transformer=transformer,
+            output_transformer=output_transformer(
+                agent.name, output_format=output_format, sink=self.output_sink
+            ),
+            depends_on=list(input_sources.values()),
+            agent_runner=agent_runner,
+            policy=self._policy_for(name),
         )
+
+    def _call_settings(self, step) -> dict:
+        """
+        Returns the settings that shape a step's output besides its input: the models of the
+        agents it runs, structured output repair, and the chunking or hierarchical synthesis
+        done by its runner. They are part of the step's checkpoint hash.
+        """
+        agents = [step.agent]
+        settings = {"repair_attempts": self.repair_attempts}
+        if step.agent_runner == self.summarize_paper:
+            agents += [chunk_summarizer_agent, summary_reducer_agent]
+            settings["chunk_tokens"] = self.chunk_tokens
+        elif step.agent_runner == self.synthesize:
+            agents.append(synthesis_merger_agent(step.agent))
+            settings["synthesis_fanout"] = self.synthesis_fanout
+        settings["models"] = {agent.name: self.model_router.route(agent).models for agent in agents}
+        return settings
+
+    def _policy_for(self, step_name: str) -> StepPolicy | None:
+        """
+        Returns a fresh copy of the policy configured for a step, so that latency
+        statistics used for hedging are tracked per step.
+        """
+        policy = self.step_policies.get(step_name, self.step_policy)
+        return replace(policy) if policy is not None else None
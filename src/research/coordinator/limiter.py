@@ -0,0 +1,110 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+
+class _TokenBucket:
+    """
+    A token bucket refilled continuously up to `capacity` per minute.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.available = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """
+        Seconds until `amount` becomes available (0 if it already is).
+        """
+        return max(0.0, (min(amount, self.capacity) - self.available) / self.rate)
+
+    def take(self, amount: float) -> None:
+        self.available -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """
+    Admission controller for model requests shared by every agent call.
+
+    Bounds the number of requests in flight and enforces requests-per-minute and
+    tokens-per-minute budgets with token buckets. Callers are admitted in FIFO order,
+    so throughput settles at the provider's limits instead of bursting past them.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: Optional[int] = None,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+    ):
+        """
+        Initializes the limiter. Limits set to None are not enforced.
+
+        Args:
+            max_in_flight (int, optional): Maximum number of concurrent requests.
+            requests_per_minute (int, optional): Request budget per minute.
+            tokens_per_minute (int, optional): Token budget per minute.
+        """
+        self.max_in_flight = max_in_flight
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._requests = _TokenBucket(requests_per_minute) if requests_per_minute else None
+        self._tokens = _TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._in_flight: Optional[asyncio.Semaphore] = None
+        self._admission: Optional[asyncio.Lock] = None
+
+    @asynccontextmanager
+    async def acquire(self, tokens: int = 0) -> AsyncIterator[None]:
+        """
+        Waits until a request estimated at `tokens` tokens fits within every limit, and
+        holds an in-flight slot for the duration of the `async with` block.
+
+        Args:
+            tokens (int): Estimated number of tokens (input plus output) of the request.
+        """
+        if self.max_in_flight and self._in_flight is None:
+            self._in_flight = asyncio.Semaphore(self.max_in_flight)
+
+        if self._in_flight is None:
+            await self._admit(tokens)
+            yield
+            return
+
+        async with self._in_flight:
+            await self._admit(tokens)
+            yield
+
+    async def _admit(self, tokens: int) -> None:
+        """
+        Consumes one request and `tokens` tokens from the buckets, waiting for refills as needed.
+        """
+        if self._requests is None and self._tokens is None:
+            return
+
+        if self._admission is None:
+            self._admission = asyncio.Lock()
+
+        async with self._admission:
+            while True:
+                delay = 0.0
+                for bucket, amount in ((self._requests, 1), (self._tokens, tokens)):
+                    if bucket is not None:
+                        bucket.refill()
+                        delay = max(delay, bucket.wait_time(amount))
+
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+
+            if self._requests is not None:
+                self._requests.take(1)
+            if self._tokens is not None:
+                self._tokens.take(tokens)
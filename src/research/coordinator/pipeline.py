@@ -1,8 +1,17 @@
 import asyncio
-from dataclasses import dataclass
-from typing import Callable, Any, Union
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import AsyncIterable, Callable, Any, Optional, Union
 
 import logging
+from pydantic import ValidationError
+
+from . import tracing
+from .checkpoint import RunManifest
+from .policy import StepPolicy
+from .tracing import Tracer
+from .transformers import deserialize_model, output_schema, serialize_model
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(
@@ -10,6 +19,11 @@ logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 
+# Step and batch item (its label, or else its input hash) on whose behalf an agent call runs,
+# for attribution by agent runners
+current_step: ContextVar[Optional[str]] = ContextVar("current_step", default=None)
+current_item: ContextVar[Optional[str]] = ContextVar("current_item", default=None)
+
 
 @dataclass
 class AgentStep:
@@ -21,11 +35,34 @@ class AgentStep:
         agent: The agent instance to be called.
         input_transformer: A function that extracts input string(s) from the shared context.
         output_transformer: A function that takes (context, output) and modifies the context.
+        depends_on: Names of the steps (or agents) whose outputs this step consumes.
+            When None, the step waits for every step added before it.
+        agent_runner: Optional async function used instead of the pipeline's agent runner.
+        policy: Optional timeout, retry and hedging policy applied to the agent call.
     """
     name: str
     agent: Any
     input_transformer: Callable[[dict], str]
     output_transformer: Callable[[dict, Any], None]
+    depends_on: Optional[list[str]] = None
+    agent_runner: Optional[Callable] = None
+    policy: Optional[StepPolicy] = None
+
+
+@dataclass
+class BatchItem:
+    """
+    A labeled input of a ParallelAgentStep.
+
+    Attributes:
+        label: Name identifying the item in failure reports and usage, e.g. the paper's file name.
+        input: The agent input.
+        withdrawn: Set by the producer of a streamed batch to drop an item it already yielded,
+            e.g. when a later input supersedes it. Its agent call is cancelled and its result discarded.
+    """
+    label: str
+    input: str
+    withdrawn: bool = False
 
 
 @dataclass
@@ -36,13 +73,29 @@ class ParallelAgentStep:
     Attributes:
         name: Descriptive name of the step.
         agent: The agent instance to be run on each input.
-        input_transformer: A function that extracts a list of input strings from context.
+        input_transformer: A function that extracts a list of inputs from context, or an async
+            iterable of them so that agents start on each input as soon as it is produced.
+            Inputs are strings, or BatchItems to name them in reports.
         output_transformer: A function that takes (context, list of outputs) and modifies the context.
+        depends_on: Names of the steps (or agents) whose outputs this step consumes.
+            When None, the step waits for every step added before it.
+        agent_runner: Optional async function used instead of the pipeline's agent runner,
+            e.g. to split each input into several agent calls.
+        policy: Optional timeout, retry and hedging policy applied to each agent call of the batch.
+        min_success_ratio: When set, failed items no longer fail the step: they are retried in
+            isolation, reported, and left out of the output, as long as at least this fraction
+            of the items succeeds. When None, any failed item fails the step.
+        item_retries: Number of isolated retry rounds for failed items when `min_success_ratio` is set.
     """
     name: str
     agent: Any
-    input_transformer: Callable[[dict], list[str]]
+    input_transformer: Callable[[dict], Union[list[Union[str, BatchItem]], AsyncIterable[Union[str, BatchItem]]]]
     output_transformer: Callable[[dict, list[Any]], None]
+    depends_on: Optional[list[str]] = None
+    agent_runner: Optional[Callable] = None
+    policy: Optional[StepPolicy] = None
+    min_success_ratio: Optional[float] = None
+    item_retries: int = 0
 
 
 @dataclass
@@ -57,6 +110,72 @@ class ParallelGroup:
     name: str
     steps: list[Union[AgentStep, ParallelAgentStep]]
 
+    @property
+    def depends_on(self) -> Optional[list[str]]:
+        """
+        Union of the dependencies of the grouped steps, or None if any of them
+        waits for all preceding steps.
+        """
+        dependencies = []
+        for step in self.steps:
+            if step.depends_on is None:
+                return None
+            dependencies.extend(d for d in step.depends_on if d not in dependencies)
+        return dependencies
+
+
+@dataclass
+class ItemFailure:
+    """
+    A batch item that could not be processed.
+
+    Attributes:
+        index: Position of the item in the order the inputs were received.
+        input_hash: Hash identifying the item's input.
+        error: Description of the last error raised for the item.
+        label: Label of the item, e.g. the paper's file name, if it was given one.
+    """
+    index: int
+    input_hash: str
+    error: str
+    label: Optional[str] = None
+
+
+@dataclass
+class BatchReport:
+    """
+    Outcome of a ParallelAgentStep run with partial-failure tolerance.
+
+    Attributes:
+        step: Name of the step.
+        total: Number of items in the batch.
+        failures: Items that still failed after the isolated retries.
+    """
+    step: str
+    total: int
+    failures: list[ItemFailure] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> int:
+        return self.total - len(self.failures)
+
+    @property
+    def success_ratio(self) -> float:
+        return self.succeeded / self.total if self.total else 1.0
+
+
+class BatchFailureError(RuntimeError):
+    """
+    Raised when fewer items of a batch succeed than the step's minimum success ratio allows.
+    """
+
+    def __init__(self, report: BatchReport, min_success_ratio: float):
+        self.report = report
+        super().__init__(
+            f"Step '{report.step}' succeeded for {report.succeeded} of {report.total} items "
+            f"({report.success_ratio:.0%}), below the required {min_success_ratio:.0%}"
+        )
+
 
 # A step can be a single agent, a batch-parallel agent, or a group of concurrent agents
 PipelineStep = Union[AgentStep, ParallelAgentStep, ParallelGroup]
@@ -64,21 +183,45 @@ PipelineStep = Union[AgentStep, ParallelAgentStep, ParallelGroup]
 
 class Pipeline:
     """
-    Manages and executes a sequence of agent-based steps.
+    Manages and executes a graph of agent-based steps.
 
     Supports sequential, parallel, and batch-parallel execution.
     Each step updates the shared context dictionary through input and output transformers.
+    Steps declaring `depends_on` start as soon as those dependencies complete; steps
+    without it wait for every step added before them, preserving linear ordering.
     """
 
-    def __init__(self, context: dict = None):
+    def __init__(
+        self,
+        context: dict = None,
+        max_concurrency: Optional[int] = None,
+        manifest: Optional[RunManifest] = None,
+        resume: bool = False,
+        call_settings: Optional[Callable[[Any], Any]] = None,
+    ):
         """
         Initialize the pipeline with an optional context.
 
         Args:
             context: Dictionary storing shared state between steps.
+            max_concurrency: Maximum number of steps allowed to run at the same time.
+                None means no limit.
+            manifest: Optional run manifest in which every completed step is recorded.
+            resume: Restore steps from the manifest instead of running them when their
+                input is unchanged and their recorded output is intact.
+            call_settings: Optional function returning, for a step, the settings that shape its
+                agent's output besides the agent and its input, e.g. the models it is routed to.
+                They are part of the checkpoint hashes, so changing them re-runs the step on resume.
         """
         self.context = context or {}
         self.steps: list[PipelineStep] = []
+        self.max_concurrency = max_concurrency
+        self.manifest = manifest
+        self.resume = resume
+        self.reports: dict[str, BatchReport] = {}
+        self.timings: dict[str, tuple[float, float]] = {}
+        self.call_settings = call_settings
+        self.tracer = Tracer()
 
     def add_step(self, step: PipelineStep):
         """
@@ -89,33 +232,214 @@ class Pipeline:
         """
         self.steps.append(step)
 
+    def dependencies(self) -> dict[str, list[str]]:
+        """
+        Resolves the declared dependencies of every step into step names.
+
+        A dependency may name either a step or the agent it runs (as used by the
+        input transformers). Only steps added earlier can be depended upon, so the
+        insertion order is always a valid topological order. Names already present in
+        the initial context are inputs of the run rather than steps, and need no prerequisite.
+
+        Returns:
+            dict[str, list[str]]: Mapping of step name to the names of its prerequisite steps.
+
+        Raises:
+            ValueError: If a dependency does not match any earlier step.
+        """
+        providers: dict[str, str] = {}
+        resolved: dict[str, list[str]] = {}
+
+        for step in self.steps:
+            declared = step.depends_on
+            if declared is None:
+                resolved[step.name] = list(resolved)
+            else:
+                prerequisites = []
+                for dependency in declared:
+                    if dependency not in providers and dependency in self.context:
+                        continue
+                    if dependency not in providers:
+                        raise ValueError(
+                            f"Step '{step.name}' depends on unknown or later step '{dependency}'"
+                        )
+                    if providers[dependency] not in prerequisites:
+                        prerequisites.append(providers[dependency])
+                resolved[step.name] = prerequisites
+
+            for provided in self._provided_names(step):
+                providers[provided] = step.name
+
+        return resolved
+
+    def critical_path(self) -> tuple[float, list[str]]:
+        """
+        Computes the critical path of the last run: the chain of dependent steps with the
+        largest total measured duration, which bounds the run time under unlimited parallelism.
+
+        Returns:
+            tuple[float, list[str]]: The total duration in seconds and the step names on the path.
+        """
+        dependencies = self.dependencies()
+        longest: dict[str, tuple[float, list[str]]] = {}
+
+        for step in self.steps:
+            start, end = self.timings.get(step.name, (0.0, 0.0))
+            before = max(
+                (longest[name] for name in dependencies[step.name]),
+                key=lambda entry: entry[0],
+                default=(0.0, []),
+            )
+            longest[step.name] = (before[0] + end - start, before[1] + [step.name])
+
+        return max(longest.values(), key=lambda entry: entry[0], default=(0.0, []))
+
+    def critical_path_report(self) -> str:
+        """
+        Formats the critical path of the last run with a per-step breakdown of where the
+        time went: waiting for a slot, transformers, agent calls (and the model time
+        within them), and checkpoint serialization.
+
+        Returns:
+            str: A plain-text table.
+        """
+        total, path = self.critical_path()
+        breakdown = self.tracer.breakdown()
+        columns = ["step", "wall", "queue", "transform", "calls", "slowest", "llm", "serialize"]
+        rows = []
+
+        for name in path:
+            start, end = self.timings.get(name, (0.0, 0.0))
+            members = [name]
+            step = next(s for s in self.steps if s.name == name)
+            if isinstance(step, ParallelGroup):
+                members += [member.name for member in step.steps]
+
+            def total_of(key: str) -> float:
+                return sum(breakdown.get(member, {}).get(key, 0.0) for member in members)
+
+            rows.append([
+                name,
+                f"{end - start:.3f}s",
+                f"{total_of(tracing.QUEUE):.3f}s",
+                f"{total_of(tracing.TRANSFORM):.3f}s",
+                f"{int(total_of('calls'))}",
+                f"{max(breakdown.get(m, {}).get('slowest_call', 0.0) for m in members):.3f}s",
+                f"{total_of(tracing.LLM):.3f}s",
+                f"{total_of(tracing.SERIALIZE):.3f}s",
+            ])
+        rows.append(["total", f"{total:.3f}s", "", "", "", "", "", ""])
+
+        widths = [max(len(str(row[i])) for row in [columns] + rows) for i in range(len(columns))]
+        return "\n".join(
+            "  ".join(str(cell).ljust(width) for cell, width in zip(row, widths))
+            for row in [columns] + rows
+        )
+
+    @staticmethod
+    def _provided_names(step: PipelineStep) -> list[str]:
+        """
+        Names under which a step can be referenced as a dependency.
+        """
+        members = step.steps if isinstance(step, ParallelGroup) else [step]
+        names = [step.name]
+        for member in members:
+            names.append(member.name)
+            names.append(member.agent.name)
+        return names
+
     async def run(self, agent_runner: Callable) -> dict:
         """
-        Runs the pipeline steps in order.
+        Runs the pipeline steps, starting each one as soon as its dependencies are complete.
+
+        The start and end time of every step are kept in `self.timings`, and spans of every
+        step and agent call in `self.tracer`, which can be exported as a Chrome trace. At the
+        end of the run a critical-path breakdown is logged.
 
         Args:
             agent_runner: Async function to execute an agent with input and return output.
         """
         logger.info("Pipeline execution started.")
-        
-        for step in self.steps:
-            logger.info(f"Starting step: {step.name} ({type(step).__name__})")
 
-            try:
+        dependencies = self.dependencies()
+        semaphore = asyncio.Semaphore(self.max_concurrency) if self.max_concurrency else None
+        tasks: dict[str, asyncio.Task] = {}
+        self.tracer = Tracer()
+
+        with self.tracer.activate():
+            for step in self.steps:
+                prerequisites = [tasks[name] for name in dependencies[step.name]]
+                tasks[step.name] = asyncio.create_task(
+                    self._run_when_ready(step, prerequisites, agent_runner, semaphore)
+                )
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+
+        logger.info("Pipeline execution completed successfully.")
+        logger.info(f"Critical path breakdown:\n{self.critical_path_report()}")
+        return self.context
+
+    async def _run_when_ready(
+        self,
+        step: PipelineStep,
+        prerequisites: list[asyncio.Task],
+        agent_runner: Callable,
+        semaphore: Optional[asyncio.Semaphore],
+    ):
+        """
+        Waits for the prerequisite steps, then executes the step within the concurrency limit.
+
+        Args:
+            step: The step to execute.
+            prerequisites: Tasks of the steps this step depends on.
+            agent_runner: Async function that runs the agent and returns a result.
+            semaphore: Optional semaphore bounding the number of concurrently running steps.
+        """
+        if prerequisites:
+            await asyncio.gather(*prerequisites)
+
+        if semaphore is None:
+            await self._run_step(step, agent_runner)
+        else:
+            waiting = time.perf_counter()
+            async with semaphore:
+                tracing.add_span("waiting for a free slot", tracing.QUEUE, waiting, time.perf_counter(), step=step.name)
+                await self._run_step(step, agent_runner)
+
+    async def _run_step(self, step: PipelineStep, agent_runner: Callable):
+        """
+        Execute a step of any kind, logging its start, completion and failure.
+
+        Args:
+            step: The step to execute.
+            agent_runner: Async function that runs the agent and returns a result.
+        """
+        logger.info(f"Starting step: {step.name} ({type(step).__name__})")
+        started = time.perf_counter()
+
+        try:
+            with tracing.span(step.name, tracing.STEP, step=step.name):
                 if isinstance(step, ParallelAgentStep):
                     await self._run_parallel_agent_step(step, agent_runner)
                 elif isinstance(step, ParallelGroup):
                     await self._run_parallel_group(step, agent_runner)
                 else:
                     await self._run_single_agent_step(step, agent_runner)
-                
-                logger.info(f"Completed step: {step.name}")
-            
-            except Exception as e:
-                logger.error(f"Step failed: {step.name} — {e}", exc_info=True)
-                raise
 
-        logger.info("Pipeline execution completed successfully.")
+            logger.info(f"Completed step: {step.name}")
+
+        except Exception as e:
+            logger.error(f"Step failed: {step.name} — {e}", exc_info=True)
+            raise
+
+        finally:
+            self.timings[step.name] = (started, time.perf_counter())
 
     async def _run_single_agent_step(self, step: AgentStep, agent_runner: Callable):
         """
@@ -125,23 +449,292 @@ class Pipeline:
             step: The agent step to run.
             agent_runner: Async function that runs the agent and returns a result.
         """
-        agent_input = step.input_transformer(self.context)
-        output = await agent_runner(step.agent, agent_input)
-        step.output_transformer(self.context, output)
+        agent_runner = step.agent_runner or agent_runner
+        with tracing.span("input_transformer", tracing.TRANSFORM, step=step.name):
+            agent_input = step.input_transformer(self.context)
+            input_hash = self._input_hash(step, agent_input)
+
+        output = self._restore(step, input_hash)
+        if output is None:
+            output = await self._call_agent(step, agent_runner, agent_input)
+            if self.manifest is not None:
+                with tracing.span("checkpoint", tracing.SERIALIZE, step=step.name):
+                    self.manifest.record(step.name, input_hash, serialize_model(output))
+
+        with tracing.span("output_transformer", tracing.TRANSFORM, step=step.name):
+            step.output_transformer(self.context, output)
 
     async def _run_parallel_agent_step(self, step: ParallelAgentStep, agent_runner: Callable):
         """
         Execute a ParallelAgentStep by running the agent concurrently on a batch of inputs.
+        When the inputs are an async iterable, each agent call starts as soon as its input arrives,
+        and the results are ordered by input hash so that they do not depend on arrival order.
+
+        When resuming, items whose input was already processed in a previous run are restored
+        from the run manifest, and only new or changed inputs reach the agent.
+
+        If the step sets `min_success_ratio`, failed items are retried in isolation and then
+        dropped from the output, and a BatchReport is stored in `self.reports`.
 
         Args:
             step: The step to execute in parallel.
             agent_runner: Async function that runs the agent and returns a result.
         """
-        input_list = step.input_transformer(self.context)
-        results = await asyncio.gather(*[
-            agent_runner(step.agent, agent_input) for agent_input in input_list
-        ])
-        step.output_transformer(self.context, results)
+        agent_runner = step.agent_runner or agent_runner
+        with tracing.span("input_transformer", tracing.TRANSFORM, step=step.name):
+            inputs = step.input_transformer(self.context)
+        streamed = isinstance(inputs, AsyncIterable)
+        previous = self._restore_items(step)
+
+        tolerant = step.min_success_ratio is not None
+        inputs, labels, item_hashes, results = await self._run_batch(
+            step, agent_runner, inputs, previous, return_exceptions=tolerant
+        )
+
+        if tolerant:
+            item_hashes, results = await self._settle_failures(
+                step, agent_runner, inputs, labels, item_hashes, results
+            )
+
+        if previous:
+            reused = sum(h in previous for h in item_hashes)
+            logger.info(f"{step.name}: reused {reused} of {len(item_hashes)} items from checkpoint")
+
+        if streamed:
+            ordered = sorted(zip(item_hashes, results), key=lambda pair: pair[0])
+            item_hashes = [h for h, _ in ordered]
+            results = [result for _, result in ordered]
+
+        if self.manifest is not None:
+            with tracing.span("checkpoint", tracing.SERIALIZE, step=step.name):
+                self.manifest.record(
+                    step.name,
+                    self._batch_hash(item_hashes),
+                    [[h, serialize_model(result)] for h, result in zip(item_hashes, results)],
+                )
+
+        with tracing.span("output_transformer", tracing.TRANSFORM, step=step.name):
+            step.output_transformer(self.context, results)
+
+    async def _run_batch(
+        self,
+        step: ParallelAgentStep,
+        agent_runner: Callable,
+        inputs: Union[list[Union[str, BatchItem]], AsyncIterable[Union[str, BatchItem]]],
+        previous: dict[str, Any],
+        return_exceptions: bool = False,
+    ) -> tuple[list[str], list[Optional[str]], list[str], list[Any]]:
+        """
+        Runs the agent concurrently on every input that has no previous result. The agent
+        calls of items withdrawn while the inputs are streamed are cancelled as soon as the
+        next input (or the end of the inputs) arrives, and the items are left out of the
+        returned lists; their errors are ignored.
+
+        Args:
+            step: The step being executed.
+            agent_runner: Async function that runs the agent and returns a result.
+            inputs: The batch inputs or labeled BatchItems, as a list or async iterable.
+            previous: Previous results keyed by input hash.
+            return_exceptions: Return the exceptions of failed items in place of their results
+                instead of failing the whole batch.
+
+        Returns:
+            tuple: The inputs in the order they were received, their labels, their hashes, and
+            the corresponding results.
+        """
+        submitted: list[Union[str, BatchItem]] = []
+        received: list[str] = []
+        labels: list[Optional[str]] = []
+        item_hashes: list[str] = []
+        pending: list[Union[asyncio.Task, Any]] = []
+
+        def submit(item: Union[str, BatchItem]):
+            label, agent_input = (item.label, item.input) if isinstance(item, BatchItem) else (None, item)
+            item_hash = self._input_hash(step, agent_input)
+            submitted.append(item)
+            received.append(agent_input)
+            labels.append(label)
+            item_hashes.append(item_hash)
+            if item_hash in previous:
+                pending.append(previous[item_hash])
+            else:
+                pending.append(asyncio.create_task(
+                    self._call_agent(step, agent_runner, agent_input, item=label or item_hash)
+                ))
+
+        def cancel_withdrawn():
+            for i, item in enumerate(submitted):
+                if isinstance(item, BatchItem) and item.withdrawn and isinstance(pending[i], asyncio.Task):
+                    pending[i].cancel()
+                    pending[i].add_done_callback(lambda task: task.cancelled() or task.exception())
+                    pending[i] = None
+
+        def tasks() -> list[asyncio.Task]:
+            return [p for p in pending if isinstance(p, asyncio.Task)]
+
+        try:
+            if isinstance(inputs, AsyncIterable):
+                async for item in inputs:
+                    cancel_withdrawn()
+                    submit(item)
+                cancel_withdrawn()
+            else:
+                for item in inputs:
+                    submit(item)
+            await asyncio.gather(*tasks(), return_exceptions=return_exceptions)
+        except BaseException:
+            for task in tasks():
+                task.cancel()
+            raise
+
+        results = [
+            (p.exception() or p.result()) if isinstance(p, asyncio.Task) else p
+            for p in pending
+        ]
+
+        kept = [i for i, item in enumerate(submitted) if not (isinstance(item, BatchItem) and item.withdrawn)]
+        if len(kept) < len(submitted):
+            logger.info(f"{step.name}: discarding {len(submitted) - len(kept)} withdrawn items")
+            received, labels, item_hashes, results = (
+                [values[i] for i in kept] for values in (received, labels, item_hashes, results)
+            )
+        return received, labels, item_hashes, results
+
+    async def _settle_failures(
+        self,
+        step: ParallelAgentStep,
+        agent_runner: Callable,
+        inputs: list[str],
+        labels: list[Optional[str]],
+        item_hashes: list[str],
+        results: list[Any],
+    ) -> tuple[list[str], list[Any]]:
+        """
+        Retries failed batch items in isolation, records a BatchReport, and drops the items
+        that still failed.
+
+        Raises:
+            BatchFailureError: If the success ratio falls below the step's minimum.
+
+        Returns:
+            tuple: The hashes and results of the successful items.
+        """
+        failed = [i for i, result in enumerate(results) if isinstance(result, Exception)]
+
+        for round_number in range(1, step.item_retries + 1):
+            if not failed:
+                break
+            logger.info(f"{step.name}: retrying {len(failed)} failed items (round {round_number})")
+            retried = await asyncio.gather(*[
+                self._call_agent(step, agent_runner, inputs[i], item=labels[i] or item_hashes[i]) for i in failed
+            ], return_exceptions=True)
+            for i, result in zip(failed, retried):
+                results[i] = result
+            failed = [i for i in failed if isinstance(results[i], Exception)]
+
+        report = BatchReport(
+            step=step.name,
+            total=len(results),
+            failures=[
+                ItemFailure(
+                    index=i,
+                    input_hash=item_hashes[i],
+                    error=f"{type(results[i]).__name__}: {results[i]}",
+                    label=labels[i],
+                )
+                for i in failed
+            ],
+        )
+        self.reports[step.name] = report
+
+        for failure in report.failures:
+            logger.warning(f"{step.name}: item {failure.label or failure.index} failed — {failure.error}")
+        if report.failures:
+            logger.warning(f"{step.name}: {report.succeeded} of {report.total} items succeeded")
+
+        if report.success_ratio < step.min_success_ratio:
+            raise BatchFailureError(report, step.min_success_ratio)
+
+        failed_indices = set(failed)
+        succeeded = [i for i in range(len(results)) if i not in failed_indices]
+        return [item_hashes[i] for i in succeeded], [results[i] for i in succeeded]
+
+    @staticmethod
+    async def _call_agent(
+        step: Union[AgentStep, ParallelAgentStep],
+        agent_runner: Callable,
+        agent_input: str,
+        item: Optional[str] = None,
+    ) -> Any:
+        """
+        Runs the step's agent on one input, applying the step's policy if it has one.
+        The step name and batch item are exposed to the runner through `current_step`
+        and `current_item`.
+        """
+        step_token = current_step.set(step.name)
+        item_token = current_item.set(item)
+        try:
+            with tracing.span(step.agent.name, tracing.CALL, step=step.name, item=item):
+                if step.policy is None:
+                    return await agent_runner(step.agent, agent_input)
+                return await step.policy.run(lambda: agent_runner(step.agent, agent_input))
+        finally:
+            current_item.reset(item_token)
+            current_step.reset(step_token)
+
+    def _restore(self, step: AgentStep, input_hash: str) -> Optional[Any]:
+        """
+        Returns the checkpointed output of a step when resuming, or None if it must run.
+        """
+        if self.manifest is None or not self.resume:
+            return None
+
+        with tracing.span("restore", tracing.SERIALIZE, step=step.name):
+            data = self.manifest.lookup(step.name, input_hash)
+        if data is None:
+            return None
+
+        try:
+            output = deserialize_model(step.agent.output_type, data)
+        except ValidationError as e:
+            logger.warning(f"Discarding invalid checkpoint of step {step.name}: {e}")
+            return None
+
+        logger.info(f"Restored step from checkpoint: {step.name}")
+        return output
+
+    def _restore_items(self, step: ParallelAgentStep) -> dict[str, Any]:
+        """
+        Returns the checkpointed per-item outputs of a batch step keyed by input hash,
+        or an empty dict when not resuming.
+        """
+        if self.manifest is None or not self.resume:
+            return {}
+
+        data = self.manifest.lookup(step.name) or []
+        try:
+            return {h: deserialize_model(step.agent.output_type, item) for h, item in data}
+        except (ValidationError, TypeError, ValueError) as e:
+            logger.warning(f"Discarding invalid checkpoint of step {step.name}: {e}")
+            return {}
+
+    def _input_hash(self, step: Union[AgentStep, ParallelAgentStep], agent_input: str) -> str:
+        """
+        Hashes an agent call, including the agent's identity (instructions and output schema)
+        and the step's call settings, so prompt, schema or model changes invalidate it.
+        """
+        agent = step.agent
+        instructions = agent.instructions if isinstance(agent.instructions, str) else repr(agent.instructions)
+        schema = output_schema(agent.output_type)
+        settings = self.call_settings(step) if self.call_settings is not None else None
+        return RunManifest.hash([agent.name, instructions, schema, settings, agent_input])
+
+    @staticmethod
+    def _batch_hash(item_hashes: list[str]) -> str:
+        """
+        Hashes a batch of inputs independently of their order, which varies when streamed.
+        """
+        return RunManifest.hash(sorted(item_hashes))
 
     async def _run_parallel_group(self, group: ParallelGroup, agent_runner: Callable):
         """
@@ -155,9 +748,10 @@ class Pipeline:
             Updates context with parsed results from each step.
         """
         async def run_step(s: Union[AgentStep, ParallelAgentStep]):
-            if isinstance(s, ParallelAgentStep):
-                await self._run_parallel_agent_step(s, agent_runner)
-            else:
-                await self._run_single_agent_step(s, agent_runner)
+            with tracing.span(s.name, tracing.STEP, step=s.name, group=group.name):
+                if isinstance(s, ParallelAgentStep):
+                    await self._run_parallel_agent_step(s, agent_runner)
+                else:
+                    await self._run_single_agent_step(s, agent_runner)
 
         await asyncio.gather(*[run_step(s) for s in group.steps])
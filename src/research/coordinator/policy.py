@@ -0,0 +1,213 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from contextlib import AsyncExitStack, asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, AsyncContextManager, AsyncIterator, Awaitable, Callable, Optional
+
+import openai
+
+logger = logging.getLogger(__name__)
+
+# Errors worth retrying: timeouts, dropped connections, rate limiting and server-side failures
+TRANSIENT_ERRORS: tuple[type[BaseException], ...] = (
+    asyncio.TimeoutError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+class _AttemptClock:
+    """
+    Measures the running time of one attempt, leaving out the time during which its
+    requests are only waiting for admission (see `admit`).
+    """
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.waiting = 0
+        self.running = 0
+        self.queued = 0.0
+        self.blocked_since: Optional[float] = None
+
+    def elapsed(self) -> float:
+        now = time.monotonic()
+        blocked = now - self.blocked_since if self.blocked_since is not None else 0.0
+        return now - self.started - self.queued - blocked
+
+    def update(self, waiting: int = 0, running: int = 0) -> None:
+        """
+        Adjusts the number of waiting and running requests. The clock stops while
+        requests are waiting and none is running.
+        """
+        self.waiting += waiting
+        self.running += running
+        blocked = self.waiting > 0 and self.running == 0
+        now = time.monotonic()
+        if blocked and self.blocked_since is None:
+            self.blocked_since = now
+        elif not blocked and self.blocked_since is not None:
+            self.queued += now - self.blocked_since
+            self.blocked_since = None
+
+
+# Clock of the policy attempt the current agent call belongs to
+_attempt_clock: ContextVar[Optional[_AttemptClock]] = ContextVar("attempt_clock", default=None)
+
+
+@asynccontextmanager
+async def admit(acquire: AsyncContextManager) -> AsyncIterator[None]:
+    """
+    Enters `acquire`, typically a rate limiter slot, for a model request of the current
+    agent call. Time the call spends only waiting to be admitted does not count towards
+    the step policy's timeout, hedge delay or latencies.
+
+    Args:
+        acquire: Async context manager admitting the request.
+    """
+    clock = _attempt_clock.get()
+    if clock is None:
+        async with acquire:
+            yield
+        return
+
+    async with AsyncExitStack() as stack:
+        clock.update(waiting=1)
+        try:
+            await stack.enter_async_context(acquire)
+        finally:
+            clock.update(waiting=-1, running=1)
+        try:
+            yield
+        finally:
+            clock.update(running=-1)
+
+
+@dataclass
+class StepPolicy:
+    """
+    Execution policy for the agent calls of a pipeline step.
+
+    Attributes:
+        timeout: Seconds after which a single attempt is abandoned. None means no timeout.
+            Time spent waiting for the rate limiter (see `admit`) is not counted.
+        retries: Number of additional attempts after a transient error.
+        backoff: Delay before the first retry, in seconds; doubled on every further retry.
+        max_backoff: Upper bound of the retry delay, in seconds.
+        retry_on: Exception types considered transient.
+        hedge_percentile: When set (e.g. 0.95), a duplicate request is launched once an attempt
+            has been running longer than this percentile of the step's observed latencies, and
+            whichever finishes first is used. Like the timeout, latencies leave out the time
+            spent waiting for the rate limiter.
+        hedge_min_samples: Number of completed calls required before hedging starts.
+    """
+    timeout: Optional[float] = None
+    retries: int = 0
+    backoff: float = 1.0
+    max_backoff: float = 30.0
+    retry_on: tuple[type[BaseException], ...] = TRANSIENT_ERRORS
+    hedge_percentile: Optional[float] = None
+    hedge_min_samples: int = 10
+    _latencies: deque = field(default_factory=lambda: deque(maxlen=500), init=False, repr=False, compare=False)
+
+    async def run(self, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Runs `call` under the policy's timeout, retry and hedging rules.
+
+        Args:
+            call: Zero-argument async function performing one agent call.
+
+        Returns:
+            Any: The result of the first successful attempt.
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                return await self._hedged(call)
+            except self.retry_on as e:
+                if attempt == self.retries:
+                    raise
+                delay = min(self.max_backoff, self.backoff * 2 ** attempt) * random.uniform(0.5, 1.0)
+                logger.warning(
+                    f"Transient error ({type(e).__name__}: {e}); retrying in {delay:.1f}s "
+                    f"(attempt {attempt + 2} of {self.retries + 1})"
+                )
+                await asyncio.sleep(delay)
+
+    def hedge_delay(self) -> Optional[float]:
+        """
+        Returns the latency after which a duplicate request is launched, or None if hedging is inactive.
+        """
+        if self.hedge_percentile is None or len(self._latencies) < self.hedge_min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(self.hedge_percentile * len(ordered)))]
+
+    async def _hedged(self, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Performs one attempt, racing a duplicate request against it once it exceeds the hedge delay.
+        """
+        delay = self.hedge_delay()
+        if delay is None:
+            return await self._timed(call, _AttemptClock())
+
+        clock = _AttemptClock()
+        first = asyncio.create_task(self._timed(call, clock))
+        tasks = {first}
+        try:
+            if not await _run_for(first, clock, delay):
+                logger.info(f"Hedging request still running after {delay:.2f}s")
+                tasks.add(asyncio.create_task(self._timed(call, _AttemptClock())))
+
+            error: Optional[BaseException] = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _timed(self, call: Callable[[], Awaitable[Any]], clock: _AttemptClock) -> Any:
+        """
+        Performs a single request under the timeout, recording its latency on success.
+        Both are measured on `clock`, which the request's admissions pause.
+        """
+        token = _attempt_clock.set(clock)
+        try:
+            task = asyncio.ensure_future(call())
+        finally:
+            _attempt_clock.reset(token)
+
+        try:
+            if self.timeout is not None and not await _run_for(task, clock, self.timeout):
+                raise asyncio.TimeoutError()
+            result = await task
+        finally:
+            if not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self._latencies.append(clock.elapsed())
+        return result
+
+
+async def _run_for(task: asyncio.Future, clock: _AttemptClock, seconds: float) -> bool:
+    """
+    Waits until `task` is done or `clock` has run for `seconds`.
+
+    Returns:
+        bool: Whether the task is done.
+    """
+    while not task.done():
+        remaining = seconds - clock.elapsed()
+        if remaining <= 0:
+            return False
+        await asyncio.wait({task}, timeout=remaining)
+    return True
@@ -0,0 +1,186 @@
+import json
+import re
+from typing import Any, Optional
+
+import pydantic_core
+from pydantic import TypeAdapter, ValidationError
+
+from research.agents.response import OutputRepair
+
+_EMBEDDED_JSON = re.compile(r"^Invalid JSON when parsing (.*) for .*?; ", re.DOTALL)
+
+Loc = tuple[str | int, ...]
+
+
+def raw_output(error: Exception) -> Optional[str]:
+    """
+    Returns the text of the response that failed structured output validation.
+
+    The text is taken from the last model response recorded on the SDK error, or from
+    the JSON quoted in the error message.
+
+    Args:
+        error (Exception): The error raised by the run.
+
+    Returns:
+        str | None: The raw response text, or None if it is not available.
+    """
+    run_data = getattr(error, "run_data", None)
+    for response in reversed(getattr(run_data, "raw_responses", None) or []):
+        parts = [
+            part.text
+            for item in response.output
+            for part in getattr(item, "content", None) or []
+            if getattr(part, "type", None) == "output_text"
+        ]
+        if parts:
+            return "".join(parts)
+
+    match = _EMBEDDED_JSON.match(str(error))
+    return match.group(1) if match else None
+
+
+def parse_partial(raw: str) -> Any:
+    """
+    Parses a possibly truncated JSON response, keeping every complete value.
+
+    Returns:
+        Any: The parsed data, or None if the text is not JSON.
+    """
+    try:
+        return pydantic_core.from_json(raw, allow_partial=True)
+    except ValueError:
+        return None
+
+
+def validate(output_type: type, data: Any) -> tuple[Any, Optional[ValidationError]]:
+    """
+    Validates data against an agent's output type.
+
+    Returns:
+        tuple[Any, ValidationError | None]: The validated output and None, or None and the error.
+    """
+    try:
+        return TypeAdapter(output_type).validate_python(data), None
+    except ValidationError as e:
+        return None, e
+
+
+def invalid_paths(error: ValidationError) -> dict[Loc, list[dict]]:
+    """
+    Groups validation errors by the object they should be fixed in.
+
+    A missing or invalid field is fixed by regenerating the object that contains it
+    (e.g. one experiment of a list), so the model sees the field in context; errors at
+    the top level of the output are fixed on the field itself. Paths nested in another
+    invalid path are merged into it.
+
+    Returns:
+        dict[Loc, list[dict]]: The errors of each path to fix, with the field relative to it.
+    """
+    grouped: dict[Loc, list[dict]] = {}
+    for detail in error.errors():
+        loc = tuple(detail["loc"])
+        path = loc[:-1] if len(loc) > 1 else loc
+        grouped.setdefault(path, []).append(
+            {"field": dotted(loc[len(path):]) or None, "message": detail["msg"]}
+        )
+
+    paths = sorted(grouped, key=len)
+    merged: dict[Loc, list[dict]] = {}
+    for path in paths:
+        parent = next((p for p in merged if path[:len(p)] == p), None)
+        if parent is None:
+            merged[path] = grouped[path]
+        else:
+            merged[parent].extend(
+                {**e, "field": dotted(path[len(parent):] + ((e["field"],) if e["field"] else ()))}
+                for e in grouped[path]
+            )
+    return merged
+
+
+def repair_input(output_type: type, data: Any, error: ValidationError) -> tuple[str, list[Loc]]:
+    """
+    Builds the input of the repair agent: the output schema, the invalid parts with
+    their current values and errors, and the remaining valid parts as context.
+
+    Args:
+        output_type (type): The agent's output type.
+        data (Any): The partially valid output.
+        error (ValidationError): The validation error of `data`.
+
+    Returns:
+        tuple[str, list[Loc]]: The JSON input and the paths the repair must fix.
+    """
+    paths = invalid_paths(error)
+    invalid = [
+        {"path": dotted(path), "current_value": _get(data, path), "errors": errors}
+        for path, errors in paths.items()
+    ]
+    context = data
+    for path in paths:
+        context = _set(context, path, "<invalid>")
+
+    agent_input = json.dumps(
+        {"schema": TypeAdapter(output_type).json_schema(), "invalid": invalid, "context": context},
+        ensure_ascii=False,
+    )
+    return agent_input, list(paths)
+
+
+def apply_fixes(data: Any, repair: OutputRepair, paths: list[Loc]) -> Any:
+    """
+    Merges the repaired values into the partial output. Fixes for paths that were not
+    requested, or whose value is not valid JSON, are ignored.
+
+    Returns:
+        Any: A copy of `data` with the fixes applied.
+    """
+    requested = {dotted(path): path for path in paths}
+    for fix in repair.fixes:
+        path = requested.get(fix.path)
+        if path is None:
+            continue
+        try:
+            value = json.loads(fix.value_json)
+        except ValueError:
+            continue
+        data = _set(data, path, value)
+    return data
+
+
+def dotted(path: Loc) -> str:
+    """
+    Formats a path as a dotted string, e.g. "experiments.2".
+    """
+    return ".".join(str(part) for part in path)
+
+
+def _get(data: Any, path: Loc) -> Any:
+    for part in path:
+        try:
+            data = data[part]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return data
+
+
+def _set(data: Any, path: Loc, value: Any) -> Any:
+    """
+    Returns a copy of `data` with the value at `path` replaced, creating missing
+    objects on the way and extending lists as needed.
+    """
+    if not path:
+        return value
+    head, rest = path[0], path[1:]
+
+    if isinstance(head, int):
+        items = list(data) if isinstance(data, list) else []
+        items.extend([None] * (head + 1 - len(items)))
+        items[head] = _set(items[head], rest, value)
+        return items
+
+    obj = dict(data) if isinstance(data, dict) else {}
+    obj[head] = _set(obj.get(head), rest, value)
+    return obj
@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Union
+
+from agents import ModelBehaviorError
+from pydantic import ValidationError
+
+# Errors meaning the model produced output that does not fit the agent's output_type
+ESCALATION_ERRORS: tuple[type[Exception], ...] = (ModelBehaviorError, ValidationError)
+
+
+@dataclass
+class ModelRoute:
+    """
+    The models used to run an agent.
+
+    Attributes:
+        models: Models to try in order. With more than one model the route is a cascade:
+            the next model is used only when the previous one fails structured output
+            validation or its output fails the confidence check.
+        confidence_check: Optional predicate on an agent output; returning False escalates
+            the call to the next model of the cascade.
+    """
+    models: list[str]
+    confidence_check: Optional[Callable[[Any], bool]] = None
+
+
+class ModelRouter:
+    """
+    Routing table assigning models to agents by agent name.
+    """
+
+    def __init__(
+        self,
+        default: Union[str, list[str], ModelRoute] = "gpt-4o-mini",
+        routes: Optional[dict[str, Union[str, list[str], ModelRoute]]] = None,
+    ):
+        """
+        Initializes the router.
+
+        Args:
+            default: Model, cascade of models, or route used for agents without a specific route.
+            routes: Mapping of agent name to a model, a cascade of models, or a ModelRoute.
+        """
+        self.default = self._as_route(default)
+        self.routes = {name: self._as_route(route) for name, route in (routes or {}).items()}
+
+    def route(self, agent) -> ModelRoute:
+        """
+        Returns the route for an agent.
+        """
+        return self.routes.get(agent.name, self.default)
+
+    @staticmethod
+    def _as_route(route: Union[str, list[str], ModelRoute]) -> ModelRoute:
+        if isinstance(route, ModelRoute):
+            return route
+        if isinstance(route, str):
+            return ModelRoute(models=[route])
+        return ModelRoute(models=list(route))
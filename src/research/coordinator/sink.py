@@ -0,0 +1,66 @@
+import asyncio
+import json
+from typing import Any
+
+from .artifacts import ArtifactStore
+from .transformers import serialize_model
+
+
+class OutputSink:
+    """
+    Asynchronous write-behind persistence of agent outputs.
+
+    Writes are scheduled on worker threads as soon as an output is produced and do
+    not block the pipeline. Outputs are stored as artifacts of the store's current run,
+    so they are written atomically. `flush` waits for every pending write and re-raises
+    the first failure.
+    """
+
+    def __init__(self, store: ArtifactStore):
+        """
+        Initializes the sink.
+
+        Args:
+            store (ArtifactStore): Store whose current run receives the outputs as `{name}.{output_format}`.
+        """
+        self.store = store
+        self._pending: set[asyncio.Task] = set()
+
+    def write(self, name: str, output_format: str, output: Any) -> None:
+        """
+        Schedules `output` to be stored as the artifact `{name}.{output_format}`.
+        Writes synchronously when called outside of a running event loop.
+
+        Args:
+            name (str): Base name of the output file, typically the agent name.
+            output_format (str): Either "json" or a plain-text extension such as "md".
+            output (Any): The agent output to persist.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write(name, output_format, output)
+            return
+
+        task = loop.create_task(asyncio.to_thread(self._write, name, output_format, output))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def flush(self) -> None:
+        """
+        Waits until all scheduled writes have completed.
+        """
+        while self._pending:
+            await asyncio.gather(*list(self._pending))
+
+    def _write(self, name: str, output_format: str, output: Any) -> None:
+        try:
+            if output_format == "json":
+                data = json.dumps(serialize_model(output), indent=2, ensure_ascii=False)
+            else:
+                data = output
+            self.store.put(f"{name}.{output_format}", data)
+
+        except Exception as e:
+            print(f"[OutputSink] Failed to write to {name}.{output_format}: {e}")
+            raise
@@ -0,0 +1,188 @@
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional
+
+# Span categories used by the pipeline and the coordinator
+STEP = "step"
+QUEUE = "queue"
+TRANSFORM = "transform"
+CALL = "call"
+LLM = "llm"
+SERIALIZE = "serialize"
+
+
+@dataclass
+class Span:
+    """
+    A timed operation within a pipeline run.
+
+    Attributes:
+        id: Unique identifier of the span within its tracer.
+        name: Name of the operation, e.g. a step or agent name.
+        category: One of the span categories (step, queue, transform, call, llm, serialize).
+        start: Start time as returned by `time.perf_counter()`.
+        end: End time as returned by `time.perf_counter()`.
+        step: Name of the pipeline step the span belongs to, if any.
+        parent: Id of the enclosing span, if any.
+        attributes: Additional details, e.g. the batch item or model.
+    """
+    id: int
+    name: str
+    category: str
+    start: float
+    end: float = 0.0
+    step: Optional[str] = None
+    parent: Optional[int] = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+_active_tracer: ContextVar[Optional["Tracer"]] = ContextVar("active_tracer", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """
+    Collects the spans of a pipeline run and formats them as a Chrome trace
+    (viewable in chrome://tracing or https://ui.perfetto.dev).
+    """
+
+    def __init__(self):
+        self.spans: list[Span] = []
+        self._ids = itertools.count(1)
+
+    @contextmanager
+    def activate(self) -> Iterator["Tracer"]:
+        """
+        Makes this tracer receive the spans opened through the module-level `span` helper
+        in the current context and in tasks created from it.
+        """
+        token = _active_tracer.set(self)
+        try:
+            yield self
+        finally:
+            _active_tracer.reset(token)
+
+    @contextmanager
+    def span(self, name: str, category: str, step: Optional[str] = None, **attributes) -> Iterator[Span]:
+        """
+        Records the duration of the enclosed block as a span.
+
+        Args:
+            name: Name of the operation.
+            category: Span category.
+            step: Pipeline step the span belongs to; inherited from the enclosing span if omitted.
+            **attributes: Additional details stored with the span.
+        """
+        parent = _current_span.get()
+        record = Span(
+            id=next(self._ids),
+            name=name,
+            category=category,
+            start=time.perf_counter(),
+            step=step or (parent.step if parent else None),
+            parent=parent.id if parent else None,
+            attributes=attributes,
+        )
+        token = _current_span.set(record)
+        try:
+            yield record
+        finally:
+            _current_span.reset(token)
+            record.end = time.perf_counter()
+            self.spans.append(record)
+
+    def add(self, name: str, category: str, start: float, end: float, step: Optional[str] = None, **attributes) -> Span:
+        """
+        Records an already measured operation as a span.
+        """
+        parent = _current_span.get()
+        record = Span(
+            id=next(self._ids),
+            name=name,
+            category=category,
+            start=start,
+            end=end,
+            step=step or (parent.step if parent else None),
+            parent=parent.id if parent else None,
+            attributes=attributes,
+        )
+        self.spans.append(record)
+        return record
+
+    def breakdown(self) -> dict[str, dict[str, float]]:
+        """
+        Aggregates span durations per step and category.
+
+        Returns:
+            dict: For every step, the total seconds per category plus the number of calls
+            and the duration of the slowest call.
+        """
+        steps: dict[str, dict[str, float]] = {}
+        for record in self.spans:
+            if record.step is None:
+                continue
+            totals = steps.setdefault(record.step, {"calls": 0, "slowest_call": 0.0})
+            totals[record.category] = totals.get(record.category, 0.0) + record.duration
+            if record.category == CALL:
+                totals["calls"] += 1
+                totals["slowest_call"] = max(totals["slowest_call"], record.duration)
+        return steps
+
+    def chrome_trace(self) -> dict:
+        """
+        Returns the spans in the Chrome trace event format.
+
+        Each step gets its own track, and each batch item its own track below it.
+        """
+        origin = min((record.start for record in self.spans), default=0.0)
+        tracks: dict[tuple, int] = {}
+        events = []
+
+        for record in sorted(self.spans, key=lambda r: r.start):
+            track = (record.step or "pipeline", record.attributes.get("item"))
+            if track not in tracks:
+                tracks[track] = len(tracks) + 1
+                label = track[0] if track[1] is None else f"{track[0]} [{str(track[1])[:12]}]"
+                events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tracks[track], "args": {"name": label}})
+
+            events.append({
+                "name": record.name,
+                "cat": record.category,
+                "ph": "X",
+                "ts": round((record.start - origin) * 1e6, 1),
+                "dur": round(record.duration * 1e6, 1),
+                "pid": 1,
+                "tid": tracks[track],
+                "args": {key: str(value) for key, value in record.attributes.items()},
+            })
+
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+@contextmanager
+def span(name: str, category: str, step: Optional[str] = None, **attributes) -> Iterator[Optional[Span]]:
+    """
+    Records a span on the active tracer, if any; does nothing outside of a traced run.
+    """
+    tracer = _active_tracer.get()
+    if tracer is None:
+        yield None
+        return
+    with tracer.span(name, category, step=step, **attributes) as record:
+        yield record
+
+
+def add_span(name: str, category: str, start: float, end: float, step: Optional[str] = None, **attributes) -> None:
+    """
+    Records an already measured operation on the active tracer, if any.
+    """
+    tracer = _active_tracer.get()
+    if tracer is not None:
+        tracer.add(name, category, start, end, step=step, **attributes)
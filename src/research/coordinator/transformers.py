@@ -1,7 +1,8 @@
 import json
-from pathlib import Path
-from pydantic import BaseModel
-from typing import Union, Any, Callable
+from pydantic import BaseModel, TypeAdapter
+from typing import Union, Any, Callable, Optional
+
+from .compaction import Compaction
 
 
 def serialize_model(model: Union[BaseModel, list, dict]):
@@ -18,14 +19,51 @@ def serialize_model(model: Union[BaseModel, list, dict]):
         return model  # Primitive types, strings, etc.
 
 
-def input_transformer(**input_sources: str) -> Callable[[dict], str]:
+def deserialize_model(output_type: Any, data: Any):
+    """
+    Validates serialized data back into an agent's output type.
+
+    Args:
+        output_type: The agent's `output_type` (a Pydantic model or other type), or None for plain text.
+        data: Data previously produced by `serialize_model`.
+
+    Returns:
+        The typed output, e.g. a Pydantic model instance or a string.
+    """
+    return TypeAdapter(str if output_type is None else output_type).validate_python(data)
+
+
+def output_schema(output_type: Any) -> Any:
+    """
+    Describes an agent's output type for hashing: the JSON schema of a Pydantic model, so
+    that any change to its fields changes the description, or else the type's repr.
+
+    Args:
+        output_type: The agent's `output_type`, or None for plain text.
+
+    Returns:
+        The JSON schema, the repr of the type, or None.
+    """
+    if output_type is None:
+        return None
+    if isinstance(output_type, type) and issubclass(output_type, BaseModel):
+        return output_type.model_json_schema()
+    return repr(output_type)
+
+
+def input_transformer(
+    compaction: Optional[dict[str, Compaction]] = None, **input_sources: str
+) -> Callable[[dict], str]:
     """
-    Returns a transformer function that loads multiple JSON files from the `outputs/` directory
-    and returns a single merged dictionary as a JSON string.
+    Returns a transformer function that collects the outputs of earlier agents from the
+    pipeline context and returns them as a single merged dictionary serialized to a JSON string.
 
     Args:
+        compaction (dict[str, Compaction], optional): Per input key, the fields to keep and the
+            token budget of that input. When given, empty values are also stripped from inputs
+            without an entry. When None, the outputs are passed on unchanged.
         **input_sources: Keyword arguments where each key is the desired key in the final dictionary
-            and each value is the agent name whose output file will be read (`outputs/{agent_name}.json`).
+            and each value is the agent name whose output is read from the context (`ctx[agent_name]`).
 
     Returns:
         A function that takes a context dictionary (ctx) and returns a JSON string containing the combined inputs.
@@ -40,54 +78,86 @@ def input_transformer(**input_sources: str) -> Callable[[dict], str]:
             combined_inputs = {}
 
             for input_key, agent_name in input_sources.items():
-                file_path = Path("outputs", f"{agent_name}.json")
-                if not file_path.exists():
-                    raise FileNotFoundError(
-                        f"[input_transformer] File not found: {file_path}"
+                if agent_name not in ctx:
+                    raise KeyError(
+                        f"[input_transformer] No output in context for: {agent_name}"
                     )
 
-                with file_path.open("r", encoding="utf-8") as f:
-                    data = json.load(f)
-
+                data = serialize_model(ctx[agent_name])
+                if compaction is not None:
+                    spec = compaction.get(input_key, Compaction())
+                    data = spec.apply(data)
+                    if spec.drop_empty and data in (None, "", [], {}):
+                        continue
                 combined_inputs[input_key] = data
 
             return json.dumps(combined_inputs, ensure_ascii=False)
 
         except Exception as e:
-            print(f"[input_transformer] Failed to load input files: {e}")
+            print(f"[input_transformer] Failed to collect inputs: {e}")
             raise
 
     return transformer
 
 
-def output_transformer(agent_name: str, output_format="json") -> Callable[[dict, Any], None]:
+def with_passages(
+    transformer: Callable[[dict], str],
+    index: Callable[[], Any],
+    query_keys: list[str],
+    k: int = 5,
+) -> Callable[[dict], str]:
     """
-    Creates a transformer function that writes the output of an agent to a file in the `outputs/` directory.
+    Wraps an input transformer so that the agent also receives the paper passages most
+    relevant to some of its inputs.
 
     Args:
-        agent_name (str): The name of the agent. Used to name the output file.
-        output_format (str, optional): Format of the output file. Either "json" or plain text. Defaults to "json".
+        transformer (Callable[[dict], str]): Input transformer producing a JSON object.
+        index (Callable[[], BM25Index]): Returns the passage index to search.
+        query_keys (list[str]): Keys of the input whose text forms the search query.
+        k (int): Number of passages to add.
 
     Returns:
-        Callable[[dict, Any], None]: A transformer function that takes the execution context and the agent output,
-        and writes the output to `outputs/{agent_name}.{output_format}`.
+        A function that takes a context dictionary (ctx) and returns the JSON input with
+        a "passages" list of `{"source": ..., "text": ...}` objects added.
+    """
+    def wrapped(ctx: dict) -> str:
+        payload = json.loads(transformer(ctx))
+        query = " ".join(_strings([payload[key] for key in query_keys if key in payload]))
+        results = index().search(query, k) if query else []
+        if results:
+            payload["passages"] = [{"source": passage.source, "text": passage.text} for passage, _ in results]
+        return json.dumps(payload, ensure_ascii=False)
+
+    return wrapped
 
-    Raises:
-        Exception: If writing to the file fails, the exception is logged and re-raised.
+
+def _strings(data: Any) -> list[str]:
+    if isinstance(data, dict):
+        return [s for value in data.values() for s in _strings(value)]
+    if isinstance(data, list):
+        return [s for item in data for s in _strings(item)]
+    return [data] if isinstance(data, str) else []
+
+
+def output_transformer(agent_name: str, output_format="json", sink=None) -> Callable[[dict, Any], None]:
     """
-    def transformer(_: dict, output: Any) -> None:
-        try:
-            path = Path("outputs", f"{agent_name}.{output_format}")
-            path.parent.mkdir(parents=True, exist_ok=True)
+    Creates a transformer function that stores the output of an agent in the pipeline context,
+    and optionally persists it through an output sink.
 
-            with path.open("w", encoding="utf-8") as f:
-                if output_format == "json":
-                    json.dump(serialize_model(output), f, indent=2, ensure_ascii=False)
-                else:
-                    f.write(output)
+    Args:
+        agent_name (str): The name of the agent. Used as the context key and to name the output file.
+        output_format (str, optional): Format of the output file. Either "json" or plain text. Defaults to "json".
+        sink (OutputSink, optional): Write-behind sink that persists the output to
+            `{agent_name}.{output_format}`. When None, the output is only kept in memory.
 
-        except Exception as e:
-            print(f"[output_transformer] Failed to write to {agent_name}.{output_format}: {e}")
-            raise
+    Returns:
+        Callable[[dict, Any], None]: A transformer function that takes the execution context and the agent output,
+        and stores the typed output under `ctx[agent_name]`.
+    """
+    def transformer(ctx: dict, output: Any) -> None:
+        ctx[agent_name] = output
+
+        if sink is not None:
+            sink.write(agent_name, output_format, output)
 
     return transformer
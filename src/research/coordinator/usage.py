@@ -0,0 +1,218 @@
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from .pipeline import current_item, current_step
+
+# USD per million (input, output) tokens
+MODEL_PRICING: dict[str, tuple[float, float]] = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+}
+
+
+class BudgetExceededError(RuntimeError):
+    """
+    Raised before a model request that would take the run over its token or cost budget.
+    """
+
+
+@dataclass
+class UsageRecord:
+    """
+    Usage of a single agent call.
+
+    Attributes:
+        agent: Name of the agent.
+        model: Model the call ran on.
+        step: Pipeline step that issued the call, if any.
+        item: Batch item (e.g. paper) the call belongs to, if any.
+        input_tokens: Prompt tokens reported by the provider.
+        output_tokens: Completion tokens reported by the provider.
+        latency: Seconds spent waiting for the model.
+        cost: Cost in USD, or None if the model has no known pricing.
+        cached: Whether the response was served from the response cache.
+    """
+    agent: str
+    model: str
+    step: Optional[str]
+    item: Optional[str]
+    input_tokens: int
+    output_tokens: int
+    latency: float
+    cost: Optional[float]
+    cached: bool = False
+
+
+@dataclass
+class Reservation:
+    """
+    Budget held for an admitted call until its actual usage is recorded.
+
+    Attributes:
+        tokens: Estimated tokens of the call.
+        cost: Estimated cost of the call in USD.
+        released: Whether the reservation has been returned to the budget.
+    """
+    tokens: int
+    cost: float
+    released: bool = False
+
+
+class UsageTracker:
+    """
+    Collects token usage, latency and cost of every agent call, aggregates them per
+    step, per paper, per agent, per model and per run, and optionally enforces a
+    hard token or cost budget.
+
+    The budget is enforced at admission: every call reserves its estimated tokens and
+    cost before it is sent, so concurrent calls cannot together overrun the budget, and
+    the reservation is replaced by the actual usage when the call is recorded.
+    """
+
+    def __init__(
+        self,
+        max_tokens: Optional[int] = None,
+        max_cost: Optional[float] = None,
+        pricing: Optional[dict[str, tuple[float, float]]] = None,
+    ):
+        """
+        Initializes the tracker.
+
+        Args:
+            max_tokens (int, optional): Total token budget of the run.
+            max_cost (float, optional): Total cost budget of the run in USD.
+            pricing (dict, optional): USD per million (input, output) tokens by model.
+                Defaults to MODEL_PRICING.
+        """
+        self.max_tokens = max_tokens
+        self.max_cost = max_cost
+        self.pricing = pricing or MODEL_PRICING
+        self.records: list[UsageRecord] = []
+        self.total_tokens = 0
+        self.total_cost = 0.0
+        self.reserved_tokens = 0
+        self.reserved_cost = 0.0
+
+    def cost(self, model: str, input_tokens: int, output_tokens: int) -> Optional[float]:
+        """
+        Returns the cost of a call in USD, or None if the model has no known pricing.
+        """
+        if model not in self.pricing:
+            return None
+        input_price, output_price = self.pricing[model]
+        return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+    def reserve(self, model: str, input_tokens: int, output_tokens: int) -> Reservation:
+        """
+        Reserves the estimated tokens and cost of a call, if they fit in the budget left
+        after the recorded usage and the reservations of the calls still in flight.
+
+        The check and the reservation happen without yielding to the event loop, so they
+        are atomic with respect to concurrent calls.
+
+        Returns:
+            Reservation: To be passed to `record` once the call completes, or to `release` if it fails.
+
+        Raises:
+            BudgetExceededError: If the call could take the run over its budget.
+        """
+        tokens = input_tokens + output_tokens
+        if self.max_tokens is not None and self.total_tokens + self.reserved_tokens + tokens > self.max_tokens:
+            raise BudgetExceededError(
+                f"Token budget of {self.max_tokens} would be exceeded "
+                f"({self.total_tokens} used, {self.reserved_tokens} reserved, ~{tokens} requested)"
+            )
+
+        cost = self.cost(model, input_tokens, output_tokens) or 0.0
+        if self.max_cost is not None and self.total_cost + self.reserved_cost + cost > self.max_cost:
+            raise BudgetExceededError(
+                f"Cost budget of ${self.max_cost:.2f} would be exceeded "
+                f"(${self.total_cost:.4f} used, ${self.reserved_cost:.4f} reserved, ~${cost:.4f} requested)"
+            )
+
+        self.reserved_tokens += tokens
+        self.reserved_cost += cost
+        return Reservation(tokens=tokens, cost=cost)
+
+    def release(self, reservation: Reservation) -> None:
+        """
+        Returns a reservation to the budget. Releasing it more than once has no effect.
+        """
+        if reservation.released:
+            return
+        reservation.released = True
+        self.reserved_tokens -= reservation.tokens
+        self.reserved_cost -= reservation.cost
+
+    def record(
+        self,
+        agent: str,
+        model: str,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        latency: float = 0.0,
+        cached: bool = False,
+        reservation: Optional[Reservation] = None,
+    ) -> UsageRecord:
+        """
+        Records a completed call, attributing it to the current pipeline step and item.
+        The call's reservation, if any, is released in favor of its actual usage.
+        """
+        record = UsageRecord(
+            agent=agent,
+            model=model,
+            step=current_step.get(),
+            item=current_item.get(),
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            latency=latency,
+            cost=self.cost(model, input_tokens, output_tokens),
+            cached=cached,
+        )
+        if reservation is not None:
+            self.release(reservation)
+        self.records.append(record)
+        self.total_tokens += input_tokens + output_tokens
+        self.total_cost += record.cost or 0.0
+        return record
+
+    def summary(self) -> dict:
+        """
+        Aggregates the recorded usage per run, step, item, agent and model.
+        """
+        return {
+            "run": self._aggregate(self.records),
+            "per_step": self._group_by("step"),
+            "per_item": self._group_by("item"),
+            "per_agent": self._group_by("agent"),
+            "per_model": self._group_by("model"),
+        }
+
+    def report(self) -> dict:
+        """
+        Returns the aggregated usage together with every individual call.
+        """
+        return {**self.summary(), "calls": [asdict(record) for record in self.records]}
+
+    def _group_by(self, attribute: str) -> dict[str, dict]:
+        groups: dict[str, list[UsageRecord]] = {}
+        for record in self.records:
+            key = getattr(record, attribute)
+            if key is not None:
+                groups.setdefault(key, []).append(record)
+        return {key: self._aggregate(records) for key, records in groups.items()}
+
+    @staticmethod
+    def _aggregate(records: list[UsageRecord]) -> dict:
+        return {
+            "calls": len(records),
+            "cached_calls": sum(r.cached for r in records),
+            "input_tokens": sum(r.input_tokens for r in records),
+            "output_tokens": sum(r.output_tokens for r in records),
+            "latency": round(sum(r.latency for r in records), 3),
+            "cost": round(sum(r.cost or 0.0 for r in records), 6),
+            "models": sorted({r.model for r in records}),
+        }
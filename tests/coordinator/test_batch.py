@@ -0,0 +1,45 @@
+import asyncio
+import json
+
+import pytest
+
+from research.coordinator import BatchRunner, ResearchCoordinator, ResearchJob, load_jobs
+
+
+def test_load_jobs_rejects_unknown_options(tmp_path):
+    manifest = tmp_path / "topics.json"
+    manifest.write_text(json.dumps([{"papers_folder": "graphs", "modle": "gpt-4o"}]))
+
+    with pytest.raises(ValueError, match="unknown options modle"):
+        load_jobs([str(manifest)])
+
+
+def test_load_jobs_accepts_coordinator_options(tmp_path):
+    manifest = tmp_path / "topics.json"
+    manifest.write_text(json.dumps({"papers_folder": "graphs", "name": "Graphs", "model": "gpt-4o"}))
+
+    [job] = load_jobs([str(manifest)])
+
+    assert job.name == "Graphs"
+    assert job.options == {"model": "gpt-4o"}
+
+
+def test_job_setup_error_does_not_stop_the_batch(tmp_path, monkeypatch):
+    async def research(self):
+        self.artifacts.start_run(self.run_id)
+        return {}
+
+    monkeypatch.setattr(ResearchCoordinator, "research", research)
+    jobs = [
+        ResearchJob(name="broken", papers_folder="broken", options={"modle": "gpt-4o"}),
+        ResearchJob(name="graphs", papers_folder="graphs"),
+    ]
+    runner = BatchRunner(jobs, output_root=str(tmp_path), run_id="batch")
+
+    broken, graphs = asyncio.run(runner.run())
+
+    assert not broken.succeeded and "modle" in broken.error
+    assert broken.output_dir is None
+    assert graphs.succeeded
+    summary = json.loads((tmp_path / "batch-batch.json").read_text())
+    assert [job["name"] for job in summary["jobs"]] == ["broken", "graphs"]
@@ -0,0 +1,92 @@
+import asyncio
+from typing import Optional
+
+import pytest
+from pydantic import BaseModel
+
+from research.coordinator import AgentStep, BatchItem, ParallelAgentStep, Pipeline
+
+
+class _Agent:
+    name = "Echo Agent"
+    instructions = "Echo the input."
+    output_type = None
+
+
+def _withdrawing_step(output: dict) -> ParallelAgentStep:
+    """
+    A batch step whose streamed inputs yield "b", withdraw it, and then yield "a".
+    """
+    async def inputs(context):
+        b = BatchItem(label="b", input="b")
+        yield b
+        await asyncio.sleep(0.01)
+        b.withdrawn = True
+        yield BatchItem(label="a", input="a")
+
+    return ParallelAgentStep(
+        name="Echo",
+        agent=_Agent(),
+        input_transformer=inputs,
+        output_transformer=lambda context, results: output.update(results=results),
+    )
+
+
+@pytest.mark.parametrize("min_success_ratio", [None, 1.0])
+def test_withdrawn_item_is_cancelled(min_success_ratio):
+    calls, cancelled, output = [], [], {}
+
+    async def runner(agent, agent_input):
+        calls.append(agent_input)
+        if agent_input == "b":
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(agent_input)
+                raise
+        return agent_input.upper()
+
+    step = _withdrawing_step(output)
+    step.min_success_ratio = min_success_ratio
+    pipeline = Pipeline()
+    pipeline.add_step(step)
+    asyncio.run(pipeline.run(runner))
+
+    assert output["results"] == ["A"]
+    assert cancelled == ["b"]
+    assert calls == ["b", "a"]
+
+
+def test_withdrawn_item_failure_is_ignored():
+    output = {}
+
+    async def runner(agent, agent_input):
+        if agent_input == "b":
+            raise RuntimeError("boom on withdrawn item")
+        return agent_input.upper()
+
+    pipeline = Pipeline()
+    pipeline.add_step(_withdrawing_step(output))
+    asyncio.run(pipeline.run(runner))
+
+    assert output["results"] == ["A"]
+
+
+def test_input_hash_covers_output_schema():
+    class Summary(BaseModel):
+        title: str
+
+    class ExtendedSummary(BaseModel):
+        title: str
+        venue: Optional[str] = None
+
+    ExtendedSummary.__name__ = "Summary"
+
+    def hash_for(output_type) -> str:
+        agent = _Agent()
+        agent.output_type = output_type
+        step = AgentStep(name="Summary", agent=agent, input_transformer=str, output_transformer=dict.update)
+        return Pipeline()._input_hash(step, "paper")
+
+    assert hash_for(Summary) == hash_for(Summary)
+    assert hash_for(Summary) != hash_for(ExtendedSummary)
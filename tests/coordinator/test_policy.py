@@ -0,0 +1,79 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from agents import Agent
+
+from research.coordinator import RateLimiter, ResearchCoordinator, StepPolicy
+from research.coordinator import coordinator as coordinator_module
+from research.coordinator.policy import admit
+
+
+class _SlowRunner:
+    """
+    Stands in for the SDK runner, answering every request after `latency` seconds.
+    """
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def run(self, agent, agent_input, run_config=None):
+        await asyncio.sleep(self.latency)
+        usage = SimpleNamespace(input_tokens=10, output_tokens=10)
+        return SimpleNamespace(final_output=f"summary of {agent_input}", context_wrapper=SimpleNamespace(usage=usage))
+
+
+def test_queued_calls_do_not_time_out(monkeypatch):
+    monkeypatch.setattr(coordinator_module, "Runner", _SlowRunner(0.1))
+    coordinator = ResearchCoordinator(output_dir=None, rate_limiter=RateLimiter(max_in_flight=1))
+    agent = Agent(name="Summarizer", instructions="Summarize.")
+    policy = StepPolicy(timeout=0.35)
+
+    async def main():
+        return await asyncio.gather(*[
+            policy.run(lambda i=i: coordinator._run_on_model(agent, f"paper {i}", "gpt-4o-mini"))
+            for i in range(8)
+        ])
+
+    assert asyncio.run(main()) == [f"summary of paper {i}" for i in range(8)]
+    assert max(policy._latencies) < 0.2
+
+
+def test_admitted_call_still_times_out():
+    limiter = RateLimiter(max_in_flight=1)
+    policy = StepPolicy(timeout=0.1)
+
+    async def call():
+        async with admit(limiter.acquire()):
+            await asyncio.sleep(1)
+
+    async def main():
+        started = time.monotonic()
+        with pytest.raises(asyncio.TimeoutError):
+            await policy.run(call)
+        return time.monotonic() - started
+
+    assert asyncio.run(main()) < 0.5
+
+
+def test_hedge_waits_for_admission():
+    limiter = RateLimiter(max_in_flight=1)
+    policy = StepPolicy(hedge_percentile=0.5, hedge_min_samples=1)
+    policy._latencies.append(0.1)
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        async with admit(limiter.acquire()):
+            await asyncio.sleep(0.05)
+
+    async def main():
+        async with limiter.acquire():
+            task = asyncio.create_task(policy.run(call))
+            await asyncio.sleep(0.3)
+        await task
+
+    asyncio.run(main())
+    assert calls == 1
@@ -0,0 +1,55 @@
+import time
+
+from foundation import cache
+from foundation.cache import DiskCache
+
+
+class _Clock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_reads_do_not_extend_max_age(tmp_path, monkeypatch):
+    clock = _Clock(time.time())
+    monkeypatch.setattr(cache.time, "time", clock)
+    store = DiskCache(str(tmp_path), max_age=10)
+    store.set("key", b"value")
+
+    for _ in range(3):
+        clock.now += 3
+        assert store.get("key") == b"value"
+    clock.now += 3
+
+    assert store.get("key") is None
+    assert DiskCache(str(tmp_path), max_age=10).stats["entries"] == 0
+
+
+def test_max_age_counts_from_write_after_reload(tmp_path, monkeypatch):
+    clock = _Clock(time.time())
+    monkeypatch.setattr(cache.time, "time", clock)
+    DiskCache(str(tmp_path)).set("key", b"value")
+    clock.now += 6
+    assert DiskCache(str(tmp_path)).get("key") == b"value"
+
+    clock.now += 6
+    assert DiskCache(str(tmp_path), max_age=10).get("key") is None
+
+
+def test_eviction_drops_least_recently_read(tmp_path, monkeypatch):
+    clock = _Clock(time.time())
+    monkeypatch.setattr(cache.time, "time", clock)
+    store = DiskCache(str(tmp_path), max_entries=2)
+    store.set("first", b"1")
+    clock.now += 1
+    store.set("second", b"2")
+    clock.now += 1
+    store.get("first")
+    clock.now += 1
+    store.set("third", b"3")
+
+    assert store.get("first") == b"1"
+    assert store.get("second") is None
+    assert store.get("third") == b"3"
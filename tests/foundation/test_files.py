@@ -0,0 +1,11 @@
+from foundation.files import write_atomic
+
+
+def test_write_atomic_replaces_file_without_leftovers(tmp_path):
+    path = tmp_path / "index" / "manifest.json"
+
+    write_atomic(path, "first")
+    write_atomic(path, b"second")
+
+    assert path.read_bytes() == b"second"
+    assert [p.name for p in path.parent.iterdir()] == ["manifest.json"]
@@ -0,0 +1,66 @@
+import pytest
+
+from foundation.preprocess import tag_sections
+from foundation.text import chunk_text, is_heading
+
+
+@pytest.mark.parametrize("line", [
+    "Introduction",
+    "## Related Work",
+    "3. Related Work",
+    "1 Introduction",
+    "2.1 Experimental Setup",
+    "IV. Results",
+    "A. Additional Experiments",
+    "INTRODUCTION",
+    "PROPOSED FRAMEWORK",
+    "Conclusion and Future Work",
+    "Appendix B: Proofs",
+    "3.2 Attention with Linear Complexity",
+])
+def test_is_heading_accepts_section_headings(line):
+    assert is_heading(line)
+
+
+@pytest.mark.parametrize("line", [
+    "Results in Table 3 indicate that our",
+    "Methods that rely on static partitioning",
+    "16 GPUs and 2 TB of NVMe storage per node, and",
+    "2019 IEEE International Conference on Cloud",
+    "Experiments were run on 8 GPUs",
+    "The results are shown in Figure 2",
+    "3 of the 5 baselines fail",
+    "Table 2: Accuracy",
+    "We show that this works.",
+    "",
+])
+def test_is_heading_rejects_body_lines(line):
+    assert not is_heading(line)
+
+
+def test_tag_sections_leaves_body_lines_untouched():
+    text = "\n".join([
+        "1 Introduction",
+        "Methods that rely on static partitioning",
+        "do not scale. Results in Table 3 indicate that our",
+        "approach uses 16 GPUs and 2 TB of NVMe storage per node, and",
+        "2019 IEEE International Conference on Cloud",
+        "Related Work",
+    ])
+
+    tagged, sections = tag_sections(text)
+
+    assert sections == ["1 Introduction", "Related Work"]
+    assert [line for line in tagged.splitlines() if line.startswith("## ")] == [
+        "## 1 Introduction",
+        "## Related Work",
+    ]
+
+
+def test_chunk_text_splits_only_at_headings():
+    paragraph = "Methods that rely on static partitioning\n" + "word " * 40
+    text = "\n".join(["1 Introduction", paragraph, "2 Method", paragraph])
+
+    chunks = chunk_text(text, max_tokens=100)
+
+    assert [chunk.split("\n", 1)[0] for chunk in chunks] == ["1 Introduction", "2 Method"]